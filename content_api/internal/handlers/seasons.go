@@ -72,6 +72,20 @@ func (h *SeasonsHandler) GetSeasons(c *gin.Context) {
 			})
 		}
 
+		championship := make([]models.ChampionshipScenario, 0, len(s.Championship))
+		for _, cs := range s.Championship {
+			championship = append(championship, models.ChampionshipScenario{
+				DriverCode:   cs.DriverCode,
+				DriverNumber: cs.DriverNumber,
+				Points:       cs.Points,
+				MaxPoints:    cs.MaxPoints,
+				Clinched:     cs.Clinched,
+				Eliminated:   cs.Eliminated,
+				PointsNeeded: cs.PointsNeeded,
+				WinsNeeded:   cs.WinsNeeded,
+			})
+		}
+
 		seasons = append(seasons, models.Season{
 			Year:                 s.Year,
 			Rounds:               s.Rounds,
@@ -83,6 +97,7 @@ func (h *SeasonsHandler) GetSeasons(c *gin.Context) {
 			ConstructorStandings: constructorStandings,
 			TotalDrivers:         s.TotalDrivers,
 			TotalTeams:           s.TotalTeams,
+			Championship:         championship,
 		})
 	}
 
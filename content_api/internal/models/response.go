@@ -28,6 +28,17 @@ type SeasonConstructorStanding struct {
 	Wins     int32  `json:"wins"`
 }
 
+type ChampionshipScenario struct {
+	DriverCode   string `json:"driver_code"`
+	DriverNumber int32  `json:"driver_number"`
+	Points       int32  `json:"points"`
+	MaxPoints    int32  `json:"max_points"`
+	Clinched     bool   `json:"clinched"`
+	Eliminated   bool   `json:"eliminated"`
+	PointsNeeded int32  `json:"points_needed"`
+	WinsNeeded   int32  `json:"wins_needed"`
+}
+
 type Season struct {
 	Year                  int32                       `json:"year"`
 	Rounds                int32                       `json:"rounds"`
@@ -39,6 +50,7 @@ type Season struct {
 	ConstructorStandings  []SeasonConstructorStanding `json:"constructor_standings"`
 	TotalDrivers          int32                       `json:"total_drivers"`
 	TotalTeams            int32                       `json:"total_teams"`
+	Championship          []ChampionshipScenario      `json:"championship"`
 }
 
 type SeasonsResponse struct {
@@ -1,12 +1,14 @@
 package main
 
 import (
+	"context"
 	"fmt"
 	"log"
 	"net"
 	"os"
 	"os/signal"
 	"syscall"
+	"time"
 
 	"github.com/willitbemax/data_scheduler/internal/cache"
 	"github.com/willitbemax/data_scheduler/internal/config"
@@ -14,8 +16,41 @@ import (
 	grpcserver "github.com/willitbemax/data_scheduler/internal/grpc"
 	pb "github.com/willitbemax/protobuf/gen/go"
 	"google.golang.org/grpc"
+	"google.golang.org/grpc/health"
+	healthpb "google.golang.org/grpc/health/grpc_health_v1"
 )
 
+const serviceName = "content.DataSchedulerService"
+
+// watchDependencies keeps the standard gRPC health status in sync with Mongo and Redis
+// reachability so callers can probe liveness without issuing real queries.
+func watchDependencies(ctx context.Context, healthServer *health.Server, db *database.MongoDB, redisClient *cache.RedisClient) {
+	ticker := time.NewTicker(10 * time.Second)
+	defer ticker.Stop()
+
+	for {
+		pingCtx, cancel := context.WithTimeout(ctx, 3*time.Second)
+		status := healthpb.HealthCheckResponse_SERVING
+		if err := db.Ping(pingCtx); err != nil {
+			log.Printf("Health: MongoDB ping failed: %v", err)
+			status = healthpb.HealthCheckResponse_NOT_SERVING
+		} else if err := redisClient.Ping(pingCtx); err != nil {
+			log.Printf("Health: Redis ping failed: %v", err)
+			status = healthpb.HealthCheckResponse_NOT_SERVING
+		}
+		cancel()
+
+		healthServer.SetServingStatus("", status)
+		healthServer.SetServingStatus(serviceName, status)
+
+		select {
+		case <-ctx.Done():
+			return
+		case <-ticker.C:
+		}
+	}
+}
+
 func main() {
 	cfg := config.Load()
 	log.SetFlags(log.LstdFlags | log.Lshortfile)
@@ -33,6 +68,13 @@ func main() {
 	dataSchedulerServer := grpcserver.NewDataSchedulerServer(db, redisClient)
 	pb.RegisterDataSchedulerServiceServer(grpcServer, dataSchedulerServer)
 
+	healthServer := health.NewServer()
+	healthpb.RegisterHealthServer(grpcServer, healthServer)
+
+	healthCtx, stopHealth := context.WithCancel(context.Background())
+	defer stopHealth()
+	go watchDependencies(healthCtx, healthServer, db, redisClient)
+
 	listener, err := net.Listen("tcp", fmt.Sprintf(":%s", cfg.GRPCPort))
 	if err != nil {
 		log.Fatalf("Listen failed: %v", err)
@@ -51,5 +93,6 @@ func main() {
 	<-quit
 
 	log.Println("Shutting down...")
+	healthServer.Shutdown()
 	grpcServer.GracefulStop()
 }
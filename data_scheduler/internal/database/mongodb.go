@@ -40,6 +40,10 @@ func (m *MongoDB) Rounds() *mongo.Collection {
 	return m.db.Collection("rounds")
 }
 
+func (m *MongoDB) Ping(ctx context.Context) error {
+	return m.client.Ping(ctx, nil)
+}
+
 func (m *MongoDB) Disconnect() error {
 	ctx, cancel := context.WithTimeout(context.Background(), 10*time.Second)
 	defer cancel()
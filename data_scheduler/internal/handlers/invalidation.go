@@ -0,0 +1,145 @@
+package handlers
+
+import (
+	"context"
+	"fmt"
+	"log"
+	"time"
+
+	"github.com/willitbemax/data_scheduler/internal/cache"
+	pb "github.com/willitbemax/protobuf/gen/go"
+)
+
+// Writers attach a ChangeSet naming the entities that actually changed. Only those cache
+// entries (plus the aggregates containing them) are dropped and then rewarmed in the
+// background, so unchanged hot keys stay cached through frequent live refreshes. Writes
+// without a change set invalidate everything they carry.
+
+const rewarmTimeout = 30 * time.Second
+
+type roundRef struct {
+	season  int32
+	roundID int32
+}
+
+func changedRounds(data *pb.RoundsData) []roundRef {
+	var refs []roundRef
+	seen := map[roundRef]bool{}
+	add := func(ref roundRef) {
+		if !seen[ref] {
+			seen[ref] = true
+			refs = append(refs, ref)
+		}
+	}
+
+	if changes := data.GetChanges(); changes != nil {
+		for _, rc := range changes.Rounds {
+			add(roundRef{season: rc.Season, roundID: rc.RoundId})
+		}
+		// A changed session implies its round changed
+		for _, sc := range changes.Sessions {
+			add(roundRef{season: sc.Season, roundID: sc.RoundId})
+		}
+		if len(refs) > 0 {
+			return refs
+		}
+	}
+
+	for _, round := range data.Rounds {
+		add(roundRef{season: round.Season, roundID: round.RoundId})
+	}
+	return refs
+}
+
+func roundCacheKeys(refs []roundRef) []string {
+	var keys []string
+	seasons := map[int32]bool{}
+	for _, ref := range refs {
+		keys = append(keys, fmt.Sprintf("rounds:%d:%d", ref.season, ref.roundID))
+		if !seasons[ref.season] {
+			seasons[ref.season] = true
+			keys = append(keys, fmt.Sprintf("rounds:%d", ref.season))
+		}
+	}
+	return keys
+}
+
+// recordRoundVersions stores the writer's version per round and per session so readers can
+// tell whether what they hold is current without refetching it.
+func recordRoundVersions(ctx context.Context, redis *cache.RedisClient, changes *pb.ChangeSet) {
+	if changes == nil {
+		return
+	}
+	for _, rc := range changes.Rounds {
+		redis.HSet(ctx, fmt.Sprintf("versions:rounds:%d", rc.Season), fmt.Sprint(rc.RoundId), rc.Version)
+	}
+	for _, sc := range changes.Sessions {
+		redis.HSet(ctx, fmt.Sprintf("versions:sessions:%d:%d", sc.Season, sc.RoundId), sc.Type, sc.Version)
+	}
+}
+
+func (h *RoundsHandler) rewarm(refs []roundRef) {
+	ctx, cancel := context.WithTimeout(context.Background(), rewarmTimeout)
+	defer cancel()
+
+	seasons := map[int32]bool{}
+	for _, ref := range refs {
+		roundID := ref.roundID
+		if _, err := h.GetRounds(ctx, &pb.RoundsFilter{Season: ref.season, RoundId: &roundID}); err != nil {
+			log.Printf("Rewarm of rounds:%d:%d failed: %v", ref.season, ref.roundID, err)
+		}
+		seasons[ref.season] = true
+	}
+	for season := range seasons {
+		if _, err := h.GetRounds(ctx, &pb.RoundsFilter{Season: season}); err != nil {
+			log.Printf("Rewarm of rounds:%d failed: %v", season, err)
+		}
+	}
+}
+
+func changedSeasons(data *pb.SeasonsData) []int32 {
+	var years []int32
+	if changes := data.GetChanges(); changes != nil {
+		for _, sc := range changes.Seasons {
+			years = append(years, sc.Year)
+		}
+		if len(years) > 0 {
+			return years
+		}
+	}
+	for _, season := range data.Seasons {
+		years = append(years, season.Year)
+	}
+	return years
+}
+
+func seasonCacheKeys(years []int32) []string {
+	keys := []string{"seasons:all"}
+	for _, year := range years {
+		keys = append(keys, fmt.Sprintf("seasons:%d", year))
+	}
+	return keys
+}
+
+func recordSeasonVersions(ctx context.Context, redis *cache.RedisClient, changes *pb.ChangeSet) {
+	if changes == nil {
+		return
+	}
+	for _, sc := range changes.Seasons {
+		redis.HSet(ctx, "versions:seasons", fmt.Sprint(sc.Year), sc.Version)
+	}
+}
+
+func (h *SeasonsHandler) rewarm(years []int32) {
+	ctx, cancel := context.WithTimeout(context.Background(), rewarmTimeout)
+	defer cancel()
+
+	for _, year := range years {
+		if _, err := h.GetSeasons(ctx, &pb.SeasonsFilter{Year: &year}); err != nil {
+			log.Printf("Rewarm of seasons:%d failed: %v", year, err)
+		}
+	}
+	if _, err := h.GetSeasons(ctx, &pb.SeasonsFilter{}); err != nil {
+		log.Printf("Rewarm of seasons:all failed: %v", err)
+	}
+}
@@ -96,13 +96,12 @@ func (h *RoundsHandler) WriteRounds(ctx context.Context, data *pb.RoundsData) (*
 		}
 	}
 
-	if len(data.Rounds) > 0 {
-		season := data.Rounds[0].Season
-		h.cache.Del(ctx, fmt.Sprintf("rounds:%d", season))
-		for _, round := range data.Rounds {
-			h.cache.Del(ctx, fmt.Sprintf("rounds:%d:%d", season, round.RoundId))
-		}
-		log.Printf("Cache invalidated for season %d (%d rounds)", season, len(data.Rounds))
+	if refs := changedRounds(data); len(refs) > 0 {
+		keys := roundCacheKeys(refs)
+		h.cache.Del(ctx, keys...)
+		recordRoundVersions(ctx, h.cache, data.Changes)
+		log.Printf("Cache invalidated for %d changed rounds (%d keys)", len(refs), len(keys))
+		go h.rewarm(refs)
 	}
 
 	return &pb.WriteResponse{
@@ -117,15 +116,18 @@ func (h *RoundsHandler) GetRounds(ctx context.Context, filter *pb.RoundsFilter)
 	if filter.RoundId != nil {
 		cacheKey = fmt.Sprintf("rounds:%d:%d", filter.Season, *filter.RoundId)
 	}
-
-	cached, err := h.cache.Get(ctx, cacheKey)
-	if err == nil {
-		var data pb.RoundsData
-		if json.Unmarshal([]byte(cached), &data) == nil {
-			return &pb.RoundsResponse{
-				Metadata: &pb.Metadata{Date: int32(time.Now().Unix()), Cached: true},
-				Data:     &data,
-			}, nil
+	projected := len(filter.Fields) > 0
+
+	if !projected {
+		cached, err := h.cache.Get(ctx, cacheKey)
+		if err == nil {
+			var data pb.RoundsData
+			if json.Unmarshal([]byte(cached), &data) == nil {
+				return &pb.RoundsResponse{
+					Metadata: &pb.Metadata{Date: int32(time.Now().Unix()), Cached: true},
+					Data:     &data,
+				}, nil
+			}
 		}
 	}
 
@@ -135,7 +137,7 @@ func (h *RoundsHandler) GetRounds(ctx context.Context, filter *pb.RoundsFilter)
 		query["round_id"] = *filter.RoundId
 	}
 
-	cursor, err := collection.Find(ctx, query)
+	cursor, err := collection.Find(ctx, query, findOptions(filter.Fields))
 	if err != nil {
 		return nil, err
 	}
@@ -205,8 +207,10 @@ func (h *RoundsHandler) GetRounds(ctx context.Context, filter *pb.RoundsFilter)
 
 	data := &pb.RoundsData{Rounds: rounds}
 
-	jsonData, _ := json.Marshal(data)
-	h.cache.Set(ctx, cacheKey, jsonData, time.Hour)
+	if !projected {
+		jsonData, _ := json.Marshal(data)
+		h.cache.Set(ctx, cacheKey, jsonData, time.Hour)
+	}
 
 	return &pb.RoundsResponse{
 		Metadata: &pb.Metadata{Date: int32(time.Now().Unix()), Cached: false},
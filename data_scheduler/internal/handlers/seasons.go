@@ -4,12 +4,15 @@ import (
 	"context"
 	"encoding/json"
 	"fmt"
+	"log"
 	"time"
 
 	"github.com/willitbemax/data_scheduler/internal/cache"
 	"github.com/willitbemax/data_scheduler/internal/database"
 	pb "github.com/willitbemax/protobuf/gen/go"
 	"go.mongodb.org/mongo-driver/bson"
+	"go.mongodb.org/mongo-driver/mongo"
+	"go.mongodb.org/mongo-driver/mongo/options"
 )
 
 func getInt32(m bson.M, key string) int32 {
@@ -35,6 +38,20 @@ func getString(m bson.M, key string) string {
 	return ""
 }
 
+// findOptions applies a field projection when the caller asked for one. Projected reads
+// bypass the Redis cache, which only ever holds full documents.
+func findOptions(fields []string) *options.FindOptions {
+	opts := options.Find()
+	if len(fields) == 0 {
+		return opts
+	}
+	projection := bson.D{{Key: "_id", Value: 0}}
+	for _, field := range fields {
+		projection = append(projection, bson.E{Key: field, Value: 1})
+	}
+	return opts.SetProjection(projection)
+}
+
 func getBool(m bson.M, key string) bool {
 	if val, ok := m[key]; ok && val != nil {
 		if b, ok := val.(bool); ok {
@@ -56,7 +73,15 @@ func NewSeasonsHandler(db *database.MongoDB, cache *cache.RedisClient) *SeasonsH
 func (h *SeasonsHandler) WriteSeasons(ctx context.Context, data *pb.SeasonsData) (*pb.WriteResponse, error) {
 	collection := h.db.Seasons()
 
-	var operations []interface{}
+	var years []int32
+	for _, season := range data.Seasons {
+		years = append(years, season.Year)
+	}
+	if err := dropDuplicateSeasons(ctx, collection, years); err != nil {
+		return &pb.WriteResponse{Success: false, Message: err.Error()}, err
+	}
+
+	var operations []mongo.WriteModel
 	for _, season := range data.Seasons {
 		var driverStandings []bson.M
 		for _, ds := range season.DriverStandings {
@@ -81,31 +106,54 @@ func (h *SeasonsHandler) WriteSeasons(ctx context.Context, data *pb.SeasonsData)
 			})
 		}
 
-		operations = append(operations, bson.M{
-			"year":                   season.Year,
-			"rounds":                 season.Rounds,
-			"start_date":             season.StartDate,
-			"end_date":               season.EndDate,
-			"status":                 season.Status,
-			"current_round":          season.CurrentRound,
-			"driver_standings":       driverStandings,
-			"constructor_standings":  constructorStandings,
-			"total_drivers":          season.TotalDrivers,
-			"total_teams":            season.TotalTeams,
-		})
+		var championship []bson.M
+		for _, cs := range season.Championship {
+			championship = append(championship, bson.M{
+				"driver_code":   cs.DriverCode,
+				"driver_number": cs.DriverNumber,
+				"points":        cs.Points,
+				"max_points":    cs.MaxPoints,
+				"clinched":      cs.Clinched,
+				"eliminated":    cs.Eliminated,
+				"points_needed": cs.PointsNeeded,
+				"wins_needed":   cs.WinsNeeded,
+			})
+		}
+
+		filter := bson.M{"year": season.Year}
+		update := bson.M{
+			"$set": bson.M{
+				"year":                  season.Year,
+				"rounds":                season.Rounds,
+				"start_date":            season.StartDate,
+				"end_date":              season.EndDate,
+				"status":                season.Status,
+				"current_round":         season.CurrentRound,
+				"driver_standings":      driverStandings,
+				"constructor_standings": constructorStandings,
+				"total_drivers":         season.TotalDrivers,
+				"total_teams":           season.TotalTeams,
+				"championship":          championship,
+			},
+		}
+
+		operations = append(operations, mongo.NewUpdateOneModel().
+			SetFilter(filter).
+			SetUpdate(update).
+			SetUpsert(true))
 	}
 
 	if len(operations) > 0 {
-		_, err := collection.InsertMany(ctx, operations)
+		_, err := collection.BulkWrite(ctx, operations)
 		if err != nil {
 			return &pb.WriteResponse{Success: false, Message: err.Error()}, err
 		}
 	}
 
-	h.cache.Del(ctx, "seasons:all")
-	for _, season := range data.Seasons {
-		cacheKey := fmt.Sprintf("seasons:%d", season.Year)
-		h.cache.Del(ctx, cacheKey)
+	if years := changedSeasons(data); len(years) > 0 {
+		h.cache.Del(ctx, seasonCacheKeys(years)...)
+		recordSeasonVersions(ctx, h.cache, data.Changes)
+		go h.rewarm(years)
 	}
 
 	return &pb.WriteResponse{
@@ -115,20 +163,66 @@ func (h *SeasonsHandler) WriteSeasons(ctx context.Context, data *pb.SeasonsData)
 	}, nil
 }
 
+// dropDuplicateSeasons keeps only the newest document per year. Seasons used to be
+// appended on every write, so older databases hold several copies of the same year and
+// an upsert would otherwise update whichever copy Mongo returns first.
+func dropDuplicateSeasons(ctx context.Context, collection *mongo.Collection, years []int32) error {
+	if len(years) == 0 {
+		return nil
+	}
+	opts := options.Find().
+		SetProjection(bson.M{"_id": 1, "year": 1}).
+		SetSort(bson.D{{Key: "_id", Value: -1}})
+	cursor, err := collection.Find(ctx, bson.M{"year": bson.M{"$in": years}}, opts)
+	if err != nil {
+		return err
+	}
+	defer cursor.Close(ctx)
+
+	seen := map[int32]bool{}
+	var stale []interface{}
+	for cursor.Next(ctx) {
+		var doc bson.M
+		if err := cursor.Decode(&doc); err != nil {
+			continue
+		}
+		year := getInt32(doc, "year")
+		if seen[year] {
+			stale = append(stale, doc["_id"])
+			continue
+		}
+		seen[year] = true
+	}
+	if err := cursor.Err(); err != nil {
+		return err
+	}
+
+	if len(stale) > 0 {
+		if _, err := collection.DeleteMany(ctx, bson.M{"_id": bson.M{"$in": stale}}); err != nil {
+			return err
+		}
+		log.Printf("WriteSeasons: removed %d duplicate season documents", len(stale))
+	}
+	return nil
+}
+
 func (h *SeasonsHandler) GetSeasons(ctx context.Context, filter *pb.SeasonsFilter) (*pb.SeasonsResponse, error) {
 	cacheKey := "seasons:all"
 	if filter.Year != nil {
 		cacheKey = fmt.Sprintf("seasons:%d", *filter.Year)
 	}
+	projected := len(filter.Fields) > 0
 
-	cached, err := h.cache.Get(ctx, cacheKey)
-	if err == nil {
-		var data pb.SeasonsData
-		if json.Unmarshal([]byte(cached), &data) == nil {
-			return &pb.SeasonsResponse{
-				Metadata: &pb.Metadata{Date: int32(time.Now().Unix()), Cached: true},
-				Data:     &data,
-			}, nil
+	if !projected {
+		cached, err := h.cache.Get(ctx, cacheKey)
+		if err == nil {
+			var data pb.SeasonsData
+			if json.Unmarshal([]byte(cached), &data) == nil {
+				return &pb.SeasonsResponse{
+					Metadata: &pb.Metadata{Date: int32(time.Now().Unix()), Cached: true},
+					Data:     &data,
+				}, nil
+			}
 		}
 	}
 
@@ -141,7 +235,7 @@ func (h *SeasonsHandler) GetSeasons(ctx context.Context, filter *pb.SeasonsFilte
 		query["status"] = *filter.Status
 	}
 
-	cursor, err := collection.Find(ctx, query)
+	cursor, err := collection.Find(ctx, query, findOptions(filter.Fields))
 	if err != nil {
 		return nil, err
 	}
@@ -165,6 +259,7 @@ func (h *SeasonsHandler) GetSeasons(ctx context.Context, filter *pb.SeasonsFilte
 			TotalTeams:           getInt32(doc, "total_teams"),
 			DriverStandings:      []*pb.DriverStanding{},
 			ConstructorStandings: []*pb.ConstructorStanding{},
+			Championship:         []*pb.ChampionshipScenario{},
 		}
 
 		if driverStandings, ok := doc["driver_standings"].(bson.A); ok {
@@ -196,13 +291,32 @@ func (h *SeasonsHandler) GetSeasons(ctx context.Context, filter *pb.SeasonsFilte
 			}
 		}
 
+		if championship, ok := doc["championship"].(bson.A); ok {
+			for _, cs := range championship {
+				if csMap, ok := cs.(bson.M); ok {
+					season.Championship = append(season.Championship, &pb.ChampionshipScenario{
+						DriverCode:   getString(csMap, "driver_code"),
+						DriverNumber: getInt32(csMap, "driver_number"),
+						Points:       getInt32(csMap, "points"),
+						MaxPoints:    getInt32(csMap, "max_points"),
+						Clinched:     getBool(csMap, "clinched"),
+						Eliminated:   getBool(csMap, "eliminated"),
+						PointsNeeded: getInt32(csMap, "points_needed"),
+						WinsNeeded:   getInt32(csMap, "wins_needed"),
+					})
+				}
+			}
+		}
+
 		seasons = append(seasons, season)
 	}
 
 	data := &pb.SeasonsData{Seasons: seasons}
 
-	jsonData, _ := json.Marshal(data)
-	h.cache.Set(ctx, cacheKey, jsonData, time.Hour)
+	if !projected {
+		jsonData, _ := json.Marshal(data)
+		h.cache.Set(ctx, cacheKey, jsonData, time.Hour)
+	}
 
 	return &pb.SeasonsResponse{
 		Metadata: &pb.Metadata{Date: int32(time.Now().Unix()), Cached: false},
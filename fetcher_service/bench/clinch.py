@@ -0,0 +1,44 @@
+"""Championship scenario benchmark for fetcher_service.
+
+Times src.championship.championship_scenarios on a full 20-driver grid, from season
+start (every race and sprint still to run) to the final round. Run from fetcher_service/:
+
+    python bench/clinch.py [runs]
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.championship import championship_scenarios
+
+CASES = [
+    # (label, year, remaining races, remaining sprints)
+    ("season start 2024", 2024, 24, 6),
+    ("mid season 2024", 2024, 12, 3),
+    ("final round 2024", 2024, 1, 0),
+    ("season start 2025", 2025, 24, 6)
+]
+
+def grid(year: int):
+    return [
+        {"driver_code": f"D{i:02d}", "driver_number": i + 1, "points": max(0, 400 - 23 * i)}
+        for i in range(20)
+    ]
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for label, year, races, sprints in CASES:
+        standings = grid(year)
+        championship_scenarios(standings, year, races, sprints)
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            championship_scenarios(standings, year, races, sprints)
+            samples.append(time.perf_counter() - start)
+        print(f"{label:>18}: median {statistics.median(samples) * 1000:7.2f} ms   max {max(samples) * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Cold-start benchmark for fetcher_service.
+
+Measures, in fresh interpreters, how long `import src.main` takes and how long the app
+lifespan needs to reach liveness and readiness. Run from fetcher_service/ with the
+generated protobuf package on PYTHONPATH:
+
+    python bench/startup.py [runs]
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = r"""
+import asyncio, json, time
+t0 = time.perf_counter()
+import src.main as main
+t_import = time.perf_counter() - t0
+
+async def run():
+    async with main.app.router.lifespan_context(main.app):
+        t_live = time.perf_counter() - t0
+        while not main.clients.ready and main.clients.warmup_error is None:
+            await asyncio.sleep(0.005)
+        t_ready = time.perf_counter() - t0
+    return t_live, t_ready
+
+t_live, t_ready = asyncio.run(run())
+print(json.dumps({"import": t_import, "live": t_live, "ready": t_ready, "error": main.clients.warmup_error}))
+"""
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True)
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    for key in ("import", "live", "ready"):
+        values = [s[key] for s in samples]
+        print(f"{key:>6}: median {statistics.median(values) * 1000:8.1f} ms   min {min(values) * 1000:8.1f} ms")
+    errors = {s["error"] for s in samples if s["error"]}
+    if errors:
+        print(f"warm-up errors: {errors}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Index record: url key (16B blake2b), capture time, segment number, offset, compressed length,
+# body digest (8B, used to skip storing a capture identical to the previous one for that URL).
+INDEX_RECORD = struct.Struct('<16sdIQI8s')
+SEGMENT_NAME = "segment-{:06d}.dat"
+INDEX_NAME = "index.bin"
+LOCK_NAME = "writer.lock"
+
+# Minimum age of the previous capture of a URL before a new one is stored. Live polls set it
+# so a race weekend's once-a-minute renders do not each land in the archive.
+_min_interval: ContextVar[float] = ContextVar("capture_min_interval", default=0.0)
+
+@contextmanager
+def throttled(seconds: float):
+    token = _min_interval.set(seconds)
+    try:
+        yield
+    finally:
+        _min_interval.reset(token)
+
+def url_key(url: str) -> bytes:
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+
+def body_digest(body: bytes) -> bytes:
+    return hashlib.blake2b(body, digest_size=8).digest()
+
+Entry = Tuple[float, int, int, int, bytes]
+
+class _Shard:
+    """Segments and index written by one replica (its single writer), readable by all"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_NAME)
+        self.entries: Dict[bytes, List[Entry]] = {}
+        self.indexed_bytes = 0
+        self.index_inode: Optional[int] = None
+
+    def refresh(self):
+        try:
+            f = open(self.index_path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            stat = os.fstat(f.fileno())
+            if stat.st_ino != self.index_inode:
+                # Index was compacted (rewritten) after segments were dropped: reload it
+                self.entries = {}
+                self.indexed_bytes = 0
+                self.index_inode = stat.st_ino
+            usable = stat.st_size - (stat.st_size % INDEX_RECORD.size)
+            if usable <= self.indexed_bytes:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                for pos in range(self.indexed_bytes, usable, INDEX_RECORD.size):
+                    key, ts, segment, offset, length, digest = INDEX_RECORD.unpack_from(view, pos)
+                    self.entries.setdefault(key, []).append((ts, segment, offset, length, digest))
+        self.indexed_bytes = usable
+
+    def try_lock(self) -> Optional[int]:
+        """Take the shard's writer lock without waiting; the fd holds it until closed"""
+        fd = os.open(os.path.join(self.root, LOCK_NAME), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+        return fd
+
+    def segment_path(self, number: int) -> str:
+        return os.path.join(self.root, SEGMENT_NAME.format(number))
+
+    def compact(self, dropped: set):
+        """Rewrite the index without the dropped segments; readers notice the new inode"""
+        self.refresh()
+        kept = [
+            INDEX_RECORD.pack(key, *entry)
+            for key, entries in self.entries.items()
+            for entry in entries if entry[1] not in dropped
+        ]
+        kept.sort(key=lambda record: INDEX_RECORD.unpack(record)[1])
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(b"".join(kept))
+        os.replace(tmp_path, self.index_path)
+        self.refresh()
+
+    def segments(self) -> List[int]:
+        return sorted(
+            int(name[len("segment-"):-len(".dat")])
+            for name in os.listdir(self.root)
+            if name.startswith("segment-") and name.endswith(".dat")
+        )
+
+    def read(self, segment: int, offset: int, length: int) -> Tuple[Dict, bytes]:
+        with open(self.segment_path(segment), 'rb') as f:
+            f.seek(offset)
+            raw = zlib.decompress(f.read(length))
+        header, _, body = raw.partition(b"\n")
+        return json.loads(header), body
+
+class CaptureArchive:
+    """Append-only, compressed archive of raw upstream responses and rendered pages.
+
+    Each replica writes its own shard, root/replica-N/ (or root/<replica> when named),
+    so replicas sharing a volume never append to the same files. A replica claims the
+    first shard whose writer lock is free, which keeps shard names stable across container
+    recreation. Lookups merge every shard under root (plus a pre-shard archive at root
+    itself). Within a shard, each capture is one zlib-compressed record (a JSON header line
+    followed by the body) appended to the current segment file; segments roll over at
+    segment_max_bytes. A fixed-width index file is appended after the record is flushed and
+    read back through mmap, giving url -> [(timestamp, location)] lookups without touching
+    the segments.
+
+    On rollover, the oldest segments of this replica's shard and of orphaned shards (whose
+    writer lock is free) are deleted while a shard is above max_bytes or, when
+    retention_days is set, older than that. The newest capture of each URL is first copied
+    into the current segment, so a page that is never refetched (a past season) stays
+    replayable.
+    """
+
+    def __init__(self, root: str, segment_max_bytes: int = 64 * 1024 * 1024, replica: str = None,
+                 max_bytes: int = 0, retention_days: float = 0):
+        self.root = root
+        self.segment_max_bytes = segment_max_bytes
+        self.max_bytes = max_bytes
+        self.retention_days = retention_days
+        os.makedirs(root, exist_ok=True)
+        self._own, self._lock_fd = self._claim_shard(replica)
+        open(self._own.index_path, 'ab').close()
+        self._shards: Dict[str, _Shard] = {self._own.root: self._own}
+        self._lock = threading.Lock()
+        self._segment = max(self._own.segments(), default=1)
+        self._refresh()
+        self._enforce_retention()
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["CaptureArchive"]:
+        if not settings.ARCHIVE_DIR:
+            return None
+        return cls(
+            settings.ARCHIVE_DIR, settings.ARCHIVE_SEGMENT_MAX_BYTES,
+            replica=settings.ARCHIVE_REPLICA or None,
+            max_bytes=settings.ARCHIVE_MAX_BYTES,
+            retention_days=settings.ARCHIVE_RETENTION_DAYS
+        )
+
+    def _claim_shard(self, replica: Optional[str]) -> Tuple[_Shard, Optional[int]]:
+        if replica:
+            shard = _Shard(os.path.join(self.root, replica))
+            os.makedirs(shard.root, exist_ok=True)
+            fd = shard.try_lock()
+            if fd is None:
+                logger.warning(f"Archive shard {shard.root} is locked by another writer")
+            return shard, fd
+        number = 1
+        while True:
+            shard = _Shard(os.path.join(self.root, f"replica-{number}"))
+            os.makedirs(shard.root, exist_ok=True)
+            fd = shard.try_lock()
+            if fd is not None:
+                logger.info(f"Archiving captures to {shard.root}")
+                return shard, fd
+            number += 1
+
+    def _refresh(self):
+        roots = [self.root] + [
+            os.path.join(self.root, name) for name in os.listdir(self.root)
+            if os.path.isdir(os.path.join(self.root, name))
+        ]
+        for root in roots:
+            if root not in self._shards and os.path.exists(os.path.join(root, INDEX_NAME)):
+                self._shards[root] = _Shard(root)
+        for shard in self._shards.values():
+            shard.refresh()
+
+    def _carry(self, shard: _Shard, number: int, entries: List[Tuple[bytes, Entry]]) -> int:
+        """Copy records out of a segment about to be dropped into the current one"""
+        carried = 0
+        with open(shard.segment_path(number), 'rb') as src, \
+                open(self._own.segment_path(self._segment), 'ab') as dst, \
+                open(self._own.index_path, 'ab') as index:
+            for key, (ts, _, offset, length, digest) in entries:
+                src.seek(offset)
+                record = src.read(length)
+                position = dst.tell()
+                dst.write(record)
+                index.write(INDEX_RECORD.pack(key, ts, self._segment, position, length, digest))
+                carried += length
+        return carried
+
+    def _prune(self, shard: _Shard, keep_segment: Optional[int]):
+        shard.refresh()
+        segments = [n for n in shard.segments() if n != keep_segment]
+        sizes = {n: os.path.getsize(shard.segment_path(n)) for n in shard.segments()}
+        total = sum(sizes.values())
+        cutoff = time.time() - self.retention_days * 86400
+        newest = {key: max(entries, key=lambda e: e[0]) for key, entries in shard.entries.items()}
+
+        dropped = set()
+        for number in segments:
+            too_big = self.max_bytes and total > self.max_bytes
+            too_old = self.retention_days and os.path.getmtime(shard.segment_path(number)) < cutoff
+            if not (too_big or too_old):
+                break
+            keep = [(key, entry) for key, entry in newest.items() if entry[1] == number]
+            carried = self._carry(shard, number, keep) if keep else 0
+            os.remove(shard.segment_path(number))
+            total -= sizes[number] - (carried if shard is self._own else 0)
+            dropped.add(number)
+        if dropped:
+            shard.compact(dropped)
+            self._own.refresh()
+            logger.info(f"Archive retention dropped {len(dropped)} segments from {shard.root}")
+
+    def _enforce_retention(self):
+        """Apply the size/age limits to this replica's shard (never its current segment) and to
+        shards no running replica writes to any more"""
+        if not self.max_bytes and not self.retention_days:
+            return
+        self._refresh()
+        self._prune(self._own, self._segment)
+        for shard in list(self._shards.values()):
+            if shard is self._own:
+                continue
+            fd = shard.try_lock() if os.access(shard.root, os.W_OK) else None
+            if fd is None:
+                continue
+            try:
+                self._prune(shard, None)
+            except Exception as e:
+                logger.warning(f"Could not apply retention to {shard.root}: {e}")
+            finally:
+                os.close(fd)
+
+    def close(self):
+        """Release this replica's shard so the next process can claim it"""
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def put(self, url: str, body: bytes, kind: str, min_interval: float = 0, **meta) -> bool:
+        """Store a capture; returns False when it is identical to the latest one for this URL,
+        or when that one is less than min_interval seconds old"""
+        key = url_key(url)
+        digest = body_digest(body)
+        ts = time.time()
+        header = json.dumps({"url": url, "ts": ts, "kind": kind, **meta}).encode('utf-8')
+        record = zlib.compress(header + b"\n" + body, 6)
+
+        with self._lock:
+            self._own.refresh()
+            previous = self._own.entries.get(key)
+            if previous and (previous[-1][4] == digest or ts - previous[-1][0] < min_interval):
+                return False
+
+            path = self._own.segment_path(self._segment)
+            if os.path.exists(path) and os.path.getsize(path) + len(record) > self.segment_max_bytes:
+                self._segment += 1
+                path = self._own.segment_path(self._segment)
+                self._enforce_retention()
+
+            with open(path, 'ab') as f:
+                offset = f.tell()
+                f.write(record)
+            with open(self._own.index_path, 'ab') as f:
+                f.write(INDEX_RECORD.pack(key, ts, self._segment, offset, len(record), digest))
+            self._own.refresh()
+        return True
+
+    def _candidates(self, url: str) -> List[Tuple[float, _Shard, Entry]]:
+        key = url_key(url)
+        with self._lock:
+            self._refresh()
+            found = [(e[0], shard, e) for shard in self._shards.values() for e in shard.entries.get(key, [])]
+        return sorted(found, key=lambda c: c[0])
+
+    def get(self, url: str, at: float = None) -> Optional[Tuple[Dict, bytes]]:
+        """Latest capture of url taken at or before `at` (default: latest overall)"""
+        candidates = [c for c in self._candidates(url) if at is None or c[0] <= at]
+        for _, shard, (_, segment, offset, length, _) in reversed(candidates):
+            try:
+                return shard.read(segment, offset, length)
+            except FileNotFoundError:
+                # Segment dropped by its replica's retention since we loaded that index
+                continue
+        return None
+
+    def history(self, url: str) -> List[float]:
+        return [c[0] for c in self._candidates(url)]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._refresh()
+            segments = [
+                shard.segment_path(n) for shard in self._shards.values()
+                for n in shard.segments()
+            ]
+            return {
+                "urls": len({key for shard in self._shards.values() for key in shard.entries}),
+                "captures": sum(shard.indexed_bytes // INDEX_RECORD.size for shard in self._shards.values()),
+                "segments": len(segments),
+                "bytes": sum(os.path.getsize(path) for path in segments if os.path.exists(path)),
+                "replicas": len(self._shards)
+            }
+
+class CaptureMissing(Exception):
+    pass
+
+class CaptureSource:
+    """Capture-or-replay switch shared by the scrapers.
+
+    In capture mode, fetched bodies are written to the archive (when one is configured).
+    In replay mode, no network is used: bodies come from the archive as of replay_at and a
+    missing capture raises CaptureMissing.
+    """
+
+    def __init__(self, archive: Optional[CaptureArchive] = None, replay: bool = False, replay_at: float = None):
+        if replay and archive is None:
+            raise ValueError("Replay mode requires an archive")
+        self.archive = archive
+        self.replay = replay
+        self.replay_at = replay_at
+
+    def capture(self, url: str, body: bytes, kind: str, **meta):
+        if self.archive is None or self.replay:
+            return
+        try:
+            self.archive.put(url, body, kind, min_interval=_min_interval.get(), **meta)
+        except Exception as e:
+            logger.warning(f"Failed to archive capture of {url}: {e}")
+
+    async def capture_async(self, url: str, body: bytes, kind: str, **meta):
+        if self.archive is not None and not self.replay:
+            await asyncio.to_thread(self.capture, url, body, kind, **meta)
+
+    def replayed(self, url: str) -> Optional[bytes]:
+        """Archived body when replaying, None when the caller should fetch for real"""
+        if not self.replay:
+            return None
+        record = self.archive.get(url, self.replay_at)
+        if record is None:
+            raise CaptureMissing(f"No archived capture for {url}")
+        return record[1]
+
+    async def pause(self, seconds: float):
+        """Politeness delay between upstream calls; skipped when replaying"""
+        if not self.replay:
+            await asyncio.sleep(seconds)
@@ -0,0 +1,164 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Time budgets and cancellation for a single fetch. The active budget travels in a
+# ContextVar, so it follows the fetch into tasks and asyncio.to_thread workers (both copy
+# the caller's context) without being threaded through every signature.
+
+class BudgetExhausted(Exception):
+    pass
+
+class FetchCancelled(Exception):
+    pass
+
+class CancelToken:
+    """Cancellation flag shared by a budget and all of its stages.
+
+    Worker threads register cleanups (e.g. quitting a WebDriver session) that cancel() runs
+    immediately, so blocking calls in those threads fail fast instead of running to completion.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cleanups: Dict[int, Callable[[], None]] = {}
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    def register(self, key: int, cleanup: Callable[[], None]):
+        with self._lock:
+            if not self.cancelled:
+                self._cleanups[key] = cleanup
+                return
+        cleanup()
+
+    def unregister(self, key: int):
+        with self._lock:
+            self._cleanups.pop(key, None)
+
+    def cancel(self, reason: str):
+        """Blocking: runs the registered cleanups in the calling thread"""
+        with self._lock:
+            if self.cancelled:
+                return
+            self.reason = reason
+            cleanups = list(self._cleanups.values())
+            self._cleanups.clear()
+        logger.info(f"Cancelling fetch ({reason}), {len(cleanups)} cleanups pending")
+        for cleanup in cleanups:
+            try:
+                cleanup()
+            except Exception as e:
+                logger.warning(f"Cleanup after cancellation failed: {e}")
+
+class TimeBudget:
+    """Deadline for one fetch.
+
+    Stages plan how the remaining time is split (a share each), but only the fetch's own
+    deadline is enforced: a stage that overruns its share borrows from what is left instead
+    of failing the whole fetch, and later stages plan with whatever remains.
+    """
+
+    def __init__(self, seconds: float, name: str = "fetch", token: CancelToken = None, parent: "TimeBudget" = None):
+        self.name = name
+        self.seconds = seconds
+        self.planned_deadline = time.monotonic() + seconds
+        self.deadline = parent.deadline if parent else self.planned_deadline
+        self.limit = parent.limit if parent else f"{name} exceeded its {seconds:.1f}s budget"
+        self.token = token or CancelToken()
+        self._overrun_logged = False
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self):
+        if self.token.cancelled:
+            raise FetchCancelled(f"{self.name} cancelled: {self.token.reason}")
+        if self.remaining() <= 0:
+            raise BudgetExhausted(self.limit)
+        if not self._overrun_logged and time.monotonic() > self.planned_deadline:
+            self._overrun_logged = True
+            logger.info(f"{self.name} overran its planned {self.seconds:.1f}s, borrowing from the rest of the budget")
+
+    def stage(self, name: str, fraction: float) -> "TimeBudget":
+        """Child budget planned at `fraction` of what is left; cancelling either cancels both"""
+        return TimeBudget(self.remaining() * fraction, name, self.token, parent=self)
+
+_current: contextvars.ContextVar[Optional[TimeBudget]] = contextvars.ContextVar("fetch_budget", default=None)
+
+def current() -> Optional[TimeBudget]:
+    return _current.get()
+
+@contextmanager
+def scope(budget: Optional[TimeBudget]):
+    token = _current.set(budget)
+    try:
+        yield budget
+    finally:
+        _current.reset(token)
+
+@contextmanager
+def stage(name: str, fraction: float):
+    """Run the block under a planned share of the current budget (no-op without one)"""
+    parent = current()
+    with scope(parent.stage(name, fraction) if parent else None) as child:
+        yield child
+
+def check():
+    budget = current()
+    if budget:
+        budget.check()
+
+def clamp(timeout: Optional[float]) -> Optional[float]:
+    """timeout limited to the current budget's remaining time"""
+    budget = current()
+    if budget is None:
+        return timeout
+    return budget.remaining() if timeout is None else min(timeout, budget.remaining())
+
+def ensure(seconds: float):
+    """Fail now rather than start a wait the current budget cannot cover"""
+    check()
+    budget = current()
+    if budget and budget.remaining() < seconds:
+        raise BudgetExhausted(f"{budget.name} has {budget.remaining():.1f}s left, cannot wait {seconds:.1f}s")
+
+async def run_cancellable(budget: TimeBudget, coro: Awaitable, disconnected: Callable[[], Awaitable[bool]],
+                          poll_interval: float = 1.0):
+    """Run coro under budget; cancel it when the budget runs out or disconnected() turns true.
+
+    Cancellation cancels the task and fires the budget's cleanups (in a worker thread, since
+    they block), then raises BudgetExhausted or FetchCancelled.
+    """
+    with scope(budget):
+        task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=min(poll_interval, budget.remaining()))
+            if done:
+                return task.result()
+            if budget.remaining() <= 0:
+                reason = f"{budget.name} exceeded its {budget.seconds:.1f}s budget"
+                error = BudgetExhausted(reason)
+            elif await disconnected():
+                reason = "client disconnected"
+                error = FetchCancelled(f"{budget.name} cancelled: {reason}")
+            else:
+                continue
+            await asyncio.to_thread(budget.token.cancel, reason)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise error
+    finally:
+        if not task.done():
+            task.cancel()
+            asyncio.get_running_loop().run_in_executor(None, budget.token.cancel, "caller cancelled")
@@ -0,0 +1,113 @@
+from typing import Dict, List
+
+import numpy as np
+
+# Drivers' championship outcomes from the current standings and the events still to run.
+#
+# For one event, _event_response maps every score a driver can take to the most a single
+# rival can take in the same event (they cannot both finish first). Chaining those maps
+# over the remaining races and sprints is a max-plus convolution, evaluated as shifted
+# NumPy maxima: ceiling[x] is the most any one rival can add while the driver adds exactly
+# x. Every driver/rival/score combination is then checked at once by broadcasting.
+
+RACE_POINTS = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+UNREACHABLE = -(10 ** 9)
+
+def race_points(year: int) -> List[int]:
+    return RACE_POINTS
+
+def fastest_lap_point(year: int) -> bool:
+    return 2019 <= year <= 2024
+
+def sprint_points(year: int) -> List[int]:
+    if year == 2021:
+        return [3, 2, 1]
+    if year >= 2022:
+        return [8, 7, 6, 5, 4, 3, 2, 1]
+    return []
+
+def _event_response(points: List[int], fastest_lap: bool = False) -> Dict[int, int]:
+    """Driver's score in one event -> best score a rival can take in that same event"""
+    response: Dict[int, int] = {}
+
+    def offer(own: int, rival: int):
+        response[own] = max(response.get(own, UNREACHABLE), rival)
+
+    # position len(points) stands for every non-scoring finish
+    for position in range(len(points) + 1):
+        own = points[position] if position < len(points) else 0
+        rival_position = 1 if position == 0 else 0
+        rival = points[rival_position] if rival_position < len(points) else 0
+        if fastest_lap:
+            if position < len(points):
+                offer(own + 1, rival)
+            offer(own, rival + 1)
+        else:
+            offer(own, rival)
+    return response
+
+def rival_ceiling(events: List[Dict[int, int]]) -> np.ndarray:
+    """ceiling[x]: most points one rival can add while the driver adds exactly x (UNREACHABLE if x cannot happen)"""
+    ceiling = np.zeros(1, dtype=np.int64)
+    for response in events:
+        extended = np.full(len(ceiling) + max(response), UNREACHABLE, dtype=np.int64)
+        for own, rival in response.items():
+            window = extended[own:own + len(ceiling)]
+            np.maximum(window, ceiling + rival, out=window)
+        extended[extended < UNREACHABLE // 2] = UNREACHABLE
+        ceiling = extended
+    return ceiling
+
+def championship_scenarios(standings: List[Dict], year: int, remaining_races: int, remaining_sprints: int) -> List[Dict]:
+    """Per driver: max attainable points, clinched/eliminated, and what they still need.
+
+    points_needed is the smallest score from the remaining events after which no rival can
+    catch them whatever happens elsewhere; wins_needed the number of race wins that
+    guarantees the title with no other points. Both are -1 when the driver's own results
+    cannot secure it. Ties are treated as not decided (countback is not modelled).
+    """
+    if not standings:
+        return []
+
+    race = _event_response(race_points(year), fastest_lap_point(year))
+    sprint = _event_response(sprint_points(year)) if sprint_points(year) else {0: 0}
+    ceiling = rival_ceiling([race] * remaining_races + [sprint] * remaining_sprints)
+    reachable = ceiling != UNREACHABLE
+    gain = np.arange(len(ceiling))
+
+    points = np.array([s["points"] for s in standings], dtype=np.int64)
+    others = ~np.eye(len(points), dtype=bool)
+    max_points = points + gain[reachable].max()
+
+    # safe[i, x]: scoring exactly x keeps driver i ahead of every rival's best response
+    margin = points[:, None, None] + gain[None, None, :] - points[None, :, None] - ceiling[None, None, :]
+    safe = np.all((margin > 0) | ~others[:, :, None], axis=1) | ~reachable[None, :]
+    # ... and so does every higher reachable score
+    safe_from = np.flip(np.logical_and.accumulate(np.flip(safe, axis=1), axis=1), axis=1) & reachable[None, :]
+    points_needed = np.where(safe_from.any(axis=1), safe_from.argmax(axis=1), -1)
+
+    best_other = np.max(np.where(others, points[None, :], UNREACHABLE), axis=1)
+    eliminated = max_points < best_other
+
+    wins = np.arange(remaining_races + 1)
+    win = race_points(year)[0]
+    race_best, sprint_best = max(race.values()), max(sprint.values())
+    own = points[:, None] + wins[None, :] * win
+    rival = (points[None, :, None] + wins * race[win]
+             + (remaining_races - wins) * race_best + remaining_sprints * sprint_best)
+    secured = np.all((own[:, None, :] > rival) | ~others[:, :, None], axis=1)
+    wins_needed = np.where(secured.any(axis=1), secured.argmax(axis=1), -1)
+
+    return [
+        {
+            "driver_code": s["driver_code"],
+            "driver_number": s["driver_number"],
+            "points": int(points[i]),
+            "max_points": int(max_points[i]),
+            "clinched": bool(points_needed[i] == 0),
+            "eliminated": bool(eliminated[i]),
+            "points_needed": int(points_needed[i]),
+            "wins_needed": int(wins_needed[i])
+        }
+        for i, s in enumerate(standings)
+    ]
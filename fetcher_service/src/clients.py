@@ -0,0 +1,139 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class Clients:
+    """Lazily-built upstream clients shared by the HTTP handlers.
+
+    Nothing heavy (grpc, generated protobuf modules, selenium, bs4, httpx) is imported until
+    a client is first requested, so importing src.main stays cheap and the app can answer
+    liveness probes while warm_up() builds everything in the background.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._instances: Dict[str, object] = {}
+        self._lock = threading.RLock()
+        self.ready = False
+        self.warmup_error: Optional[str] = None
+        self.warmup_seconds: Optional[float] = None
+
+    def _get(self, name: str, factory: Callable[[], object]):
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            if name not in self._instances:
+                start = time.perf_counter()
+                self._instances[name] = factory()
+                logger.info(f"Initialized {name} client in {time.perf_counter() - start:.3f}s")
+            return self._instances[name]
+
+    @property
+    def archive(self):
+        def build():
+            from .archive import CaptureArchive
+            return CaptureArchive.from_settings(self.settings) or False
+        return self._get("archive", build) or None
+
+    @property
+    def guard(self):
+        def build():
+            from .resilience import UpstreamGuard
+            return UpstreamGuard.from_settings(self.settings)
+        return self._get("guard", build)
+
+    @property
+    def leases(self):
+        def build():
+            from .leases import LeaseManager
+            return LeaseManager.from_settings(self.settings)
+        return self._get("leases", build)
+
+    def capture_source(self):
+        from .archive import CaptureSource
+        return CaptureSource(self.archive)
+
+    @property
+    def ergast(self):
+        def build():
+            from .scrapers.ergast import ErgastClient
+            return ErgastClient(self.settings.ERGAST_API_URL, source=self.capture_source(), guard=self.guard)
+        return self._get("ergast", build)
+
+    @property
+    def scheduler(self):
+        def build():
+            from .grpc_client.data_scheduler_client import DataSchedulerClient
+            return DataSchedulerClient(self.settings.DATA_SCHEDULER_URI)
+        return self._get("scheduler", build)
+
+    @property
+    def f1_website(self):
+        def build():
+            from .scrapers.f1_website import F1WebsiteClient
+            from .scrapers.results_source import ResultsSource
+            return F1WebsiteClient(
+                scheduler_client=self.scheduler,
+                source=self.capture_source(),
+                guard=self.guard,
+                results_source=ResultsSource.from_settings(self.settings, self.ergast)
+            )
+        return self._get("f1_website", build)
+
+    def replay_clients(self, at: float = None):
+        """Ergast and formula1.com clients that read only from the capture archive"""
+        from .archive import CaptureSource
+        from .scrapers.ergast import ErgastClient
+        from .scrapers.f1_website import F1WebsiteClient
+        from .scrapers.results_source import ResultsSource
+
+        source = CaptureSource(self.archive, replay=True, replay_at=at)
+        live = self.f1_website
+        ergast = ErgastClient(self.settings.ERGAST_API_URL, source=source)
+        f1_website = F1WebsiteClient(
+            scheduler_client=self.scheduler,
+            render_profile=live.render_profile,
+            selenium_pool=live.selenium_pool,
+            parse_pool=live.parse_pool,
+            source=source,
+            # No verification scrapes: the archive may not hold the rendered page
+            results_source=ResultsSource(ergast, verify=False)
+        )
+        return ergast, f1_website
+
+    def created(self, name: str):
+        return self._instances.get(name)
+
+    def warm_up(self):
+        """Build every client and import the modules used on the request path (blocking)"""
+        start = time.perf_counter()
+        try:
+            self.ergast
+            self.scheduler
+            self.f1_website.selenium_pool.start_probing()
+            from protobuf.gen.python import content_pb2
+            from selenium import webdriver
+            from .scrapers import parsing
+            self.ready = True
+        except Exception as e:
+            self.warmup_error = str(e)
+            logger.error(f"Client warm-up failed: {e}")
+        finally:
+            self.warmup_seconds = time.perf_counter() - start
+            logger.info(f"Client warm-up finished in {self.warmup_seconds:.3f}s (ready={self.ready})")
+
+    def close(self):
+        archive = self.created("archive")
+        if archive:
+            archive.close()
+        f1_website = self.created("f1_website")
+        if f1_website is not None:
+            f1_website.selenium_pool.stop_probing()
+            f1_website.parse_pool.shutdown()
+        scheduler = self.created("scheduler")
+        if scheduler is not None:
+            scheduler.close()
@@ -5,6 +5,69 @@ class Settings(BaseSettings):
     ERGAST_API_URL: str = "https://api.jolpi.ca/ergast/f1"
     LOG_LEVEL: str = "INFO"
 
+    SELENIUM_URL: str = "http://localhost:4444"
+    SELENIUM_URLS: str = ""
+    SELENIUM_NODE_MAX_SESSIONS: int = 1
+    SELENIUM_NODE_FAILURE_THRESHOLD: int = 2
+    SELENIUM_NODE_EJECT_SECONDS: float = 30.0
+    SELENIUM_ACQUIRE_TIMEOUT: float = 120.0
+    SELENIUM_PROBE_INTERVAL_SECONDS: float = 15.0
+
+    SELENIUM_PAGE_LOAD_STRATEGY: str = "eager"
+    SELENIUM_BLOCK_IMAGES: bool = True
+    SELENIUM_BLOCK_FONTS: bool = True
+    SELENIUM_BLOCKED_HOSTS: str = (
+        "googletagmanager.com,google-analytics.com,doubleclick.net,googlesyndication.com,"
+        "googleadservices.com,facebook.net,hotjar.com,adsrvr.org,scorecardresearch.com"
+    )
+    SELENIUM_READY_POLL_SECONDS: float = 0.1
+    SELENIUM_STABLE_COUNT_SECONDS: float = 2.0
+
+    PARSE_POOL_KIND: str = "process"
+    PARSE_POOL_SIZE: int = 2
+    LOOP_LAG_INTERVAL_SECONDS: float = 0.5
+
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 15.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 5.0
+
+    LIVE_DETECTION_GRACE_SECONDS: int = 900
+    RESULTS_VERIFY: bool = True
+    RESULTS_VERIFY_WINDOW_SECONDS: int = 3 * 86400
+
+    HEDGE_ENABLED: bool = True
+    HEDGE_PERCENTILE: float = 95.0
+    HEDGE_MIN_SAMPLES: int = 20
+    BREAKER_FAILURE_THRESHOLD: int = 5
+    BREAKER_RESET_SECONDS: float = 30.0
+
+    FETCH_SEASONS_BUDGET_SECONDS: float = 900.0
+    FETCH_ROUNDS_BUDGET_SECONDS: float = 1800.0
+    FETCH_ROUND_BUDGET_SECONDS: float = 180.0
+    DISCONNECT_POLL_SECONDS: float = 1.0
+
+    # Empty: leases only deduplicate within this process (single replica)
+    LEASE_URI: str = ""
+    LEASE_TTL_SECONDS: float = 30.0
+    LEASE_RESULT_TTL_SECONDS: int = 120
+    LEASE_WAIT_POLL_SECONDS: float = 0.5
+
+    ARCHIVE_DIR: str = "archive"
+    ARCHIVE_SEGMENT_MAX_BYTES: int = 64 * 1024 * 1024
+    # Shard name for this replica's captures (default: hostname)
+    ARCHIVE_REPLICA: str = ""
+    ARCHIVE_MAX_BYTES: int = 4 * 1024 * 1024 * 1024
+    # Age limit is off by default: pages of past seasons are captured once and must stay replayable
+    ARCHIVE_RETENTION_DAYS: float = 0.0
+    ARCHIVE_LIVE_MIN_INTERVAL_SECONDS: float = 300.0
+
+    PLANNER_ENABLED: bool = False
+    PLANNER_SEASON: int = 0
+    PLANNER_SETTLE_SECONDS: int = 900
+    PLANNER_LIVE_POLL_SECONDS: int = 60
+    PLANNER_LIVE_GRACE_SECONDS: int = 900
+    PLANNER_CATCHUP_SECONDS: int = 21600
+    PLANNER_RELOAD_SECONDS: int = 3600
+
     class Config:
         env_file = ".env"
         case_sensitive = True
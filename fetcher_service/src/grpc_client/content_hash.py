@@ -0,0 +1,38 @@
+import hashlib
+import threading
+from typing import Dict, Hashable, Iterable, Tuple
+
+def content_hash(message) -> str:
+    return hashlib.sha256(message.SerializeToString(deterministic=True)).hexdigest()
+
+class WrittenHashes:
+    """Last successfully written content hash per entity (season year, season/round pair)"""
+
+    def __init__(self):
+        self._hashes: Dict[Hashable, str] = {}
+        self._seeded = set()
+        self._lock = threading.Lock()
+
+    def changed(self, key: Hashable, digest: str) -> bool:
+        with self._lock:
+            return self._hashes.get(key) != digest
+
+    def mark(self, items: Iterable[Tuple[Hashable, str]]):
+        with self._lock:
+            for key, digest in items:
+                self._hashes[key] = digest
+
+    def is_seeded(self, scope: Hashable) -> bool:
+        with self._lock:
+            return scope in self._seeded
+
+    def seed(self, scope: Hashable, items: Iterable[Tuple[Hashable, str]]):
+        """Record what the store already holds, without overriding hashes marked since.
+
+        When the store returns several copies of an entity the last one (the newest) wins.
+        """
+        stored = dict(items)
+        with self._lock:
+            for key, digest in stored.items():
+                self._hashes.setdefault(key, digest)
+            self._seeded.add(scope)
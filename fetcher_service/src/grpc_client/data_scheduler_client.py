@@ -1,54 +1,151 @@
 import grpc
 import logging
-from protobuf.gen.python import services_pb2, services_pb2_grpc
+import time
+from grpc_health.v1 import health_pb2, health_pb2_grpc
+from protobuf.gen.python import content_pb2, services_pb2, services_pb2_grpc
+from .content_hash import WrittenHashes, content_hash
 
 logger = logging.getLogger(__name__)
 
+# Field projections for lookups that do not need full documents
+DRIVER_NUMBER_FIELDS = ["year", "driver_standings.driver_code", "driver_standings.driver_number"]
+SEASON_ROUNDS_FIELDS = ["year", "rounds"]
+ROUND_SCHEDULE_FIELDS = [
+    "round_id", "season", "name", "first_date", "end_date",
+    "sessions.type", "sessions.date", "sessions.status", "sessions.is_live"
+]
+
+def _session_entries(rnd):
+    return [(('sessions', rnd.season, rnd.round_id, s.type), content_hash(s)) for s in rnd.sessions]
+
 class DataSchedulerClient:
     def __init__(self, uri: str):
         self.channel = grpc.insecure_channel(uri)
         self.stub = services_pb2_grpc.DataSchedulerServiceStub(self.channel)
+        self.health_stub = health_pb2_grpc.HealthStub(self.channel)
+        self._written = WrittenHashes()
+
+    def _seed_season_hashes(self, year: int):
+        # One year at a time: served from the scheduler's per-year cache instead of
+        # loading every season document
+        scope = ('seasons', year)
+        if self._written.is_seeded(scope):
+            return
+        try:
+            stored = self.stub.GetSeasons(services_pb2.SeasonsFilter(year=year)).data.seasons
+        except grpc.RpcError as e:
+            logger.warning(f"Could not seed season hashes for {year} from scheduler: {e}")
+            stored = []
+        self._written.seed(scope, [(('seasons', s.year), content_hash(s)) for s in stored])
+
+    def _seed_round_hashes(self, season: int):
+        scope = ('rounds', season)
+        if self._written.is_seeded(scope):
+            return
+        try:
+            stored = self.stub.GetRounds(services_pb2.RoundsFilter(season=season)).data.rounds
+        except grpc.RpcError as e:
+            logger.warning(f"Could not seed round hashes for season {season} from scheduler: {e}")
+            stored = []
+        items = []
+        for r in stored:
+            items.append((('rounds', r.season, r.round_id), content_hash(r)))
+            items.extend(_session_entries(r))
+        self._written.seed(scope, items)
+
+    def _split_changed(self, entries, force: bool):
+        changed = [e for e in entries if force or self._written.changed(e[0], e[1])]
+        return changed, len(entries) - len(changed)
 
-    def write_seasons(self, seasons_data):
+    def write_seasons(self, seasons_data, force: bool = False):
+        if not force:
+            for year in {s.year for s in seasons_data.seasons}:
+                self._seed_season_hashes(year)
+        entries = [(('seasons', s.year), content_hash(s), s) for s in seasons_data.seasons]
+        changed, skipped = self._split_changed(entries, force)
+        logger.info(f"Seasons write: {len(changed)} changed, {skipped} unchanged")
+        if not changed:
+            return services_pb2.WriteResponse(success=True, message="No changes", records_skipped=skipped)
+
+        version = int(time.time() * 1000)
+        request = content_pb2.SeasonsData(seasons=[e[2] for e in changed])
+        request.changes.seasons.extend(content_pb2.SeasonChange(year=e[2].year, version=version) for e in changed)
         try:
-            return self.stub.WriteSeasons(seasons_data)
+            response = self.stub.WriteSeasons(request)
         except grpc.RpcError as e:
             logger.error(f"Write error: {e}")
             raise
 
-    def get_seasons(self, year=None, status=None):
+        if response.success:
+            self._written.mark((e[0], e[1]) for e in changed)
+        response.records_skipped = skipped
+        return response
+
+    def get_seasons(self, year=None, status=None, fields=None):
         try:
             filter_req = services_pb2.SeasonsFilter()
             if year is not None:
                 filter_req.year = year
             if status is not None:
                 filter_req.status = status
+            if fields:
+                filter_req.fields.extend(fields)
             return self.stub.GetSeasons(filter_req)
         except grpc.RpcError as e:
             logger.error(f"Get error: {e}")
             raise
 
-    def write_rounds(self, rounds_data):
+    def write_rounds(self, rounds_data, force: bool = False):
+        if not force:
+            for season in {r.season for r in rounds_data.rounds}:
+                self._seed_round_hashes(season)
+        entries = [(('rounds', r.season, r.round_id), content_hash(r), r) for r in rounds_data.rounds]
+        changed, skipped = self._split_changed(entries, force)
+        logger.info(f"Rounds write: {len(changed)} changed, {skipped} unchanged")
+        if not changed:
+            return services_pb2.WriteResponse(success=True, message="No changes", records_skipped=skipped)
+
+        # Session-level diff within the changed rounds, for the change set
+        sessions = [item for e in changed for item in _session_entries(e[2])]
+        changed_sessions = [key for key, digest in sessions if force or self._written.changed(key, digest)]
+
+        version = int(time.time() * 1000)
+        request = content_pb2.RoundsData(rounds=[e[2] for e in changed])
+        request.changes.rounds.extend(
+            content_pb2.RoundChange(season=e[2].season, round_id=e[2].round_id, version=version) for e in changed
+        )
+        request.changes.sessions.extend(
+            content_pb2.SessionChange(season=season, round_id=round_id, type=session_type, version=version)
+            for _, season, round_id, session_type in changed_sessions
+        )
         try:
-            return self.stub.WriteRounds(rounds_data)
+            response = self.stub.WriteRounds(request)
         except grpc.RpcError as e:
             logger.error(f"Write rounds error: {e}")
             raise
 
-    def get_rounds(self, season: int, round_id=None):
+        if response.success:
+            self._written.mark([(e[0], e[1]) for e in changed] + sessions)
+        response.records_skipped = skipped
+        return response
+
+    def get_rounds(self, season: int, round_id=None, fields=None):
         try:
             filter_req = services_pb2.RoundsFilter(season=season)
             if round_id is not None:
                 filter_req.round_id = round_id
+            if fields:
+                filter_req.fields.extend(fields)
             return self.stub.GetRounds(filter_req)
         except grpc.RpcError as e:
             logger.error(f"Get rounds error: {e}")
             raise
 
-    def health(self) -> bool:
+    def health(self, timeout: float = 5.0) -> bool:
         try:
-            self.stub.GetSeasons(services_pb2.SeasonsFilter(), timeout=5.0)
-            return True
+            request = health_pb2.HealthCheckRequest(service="content.DataSchedulerService")
+            response = self.health_stub.Check(request, timeout=timeout)
+            return response.status == health_pb2.HealthCheckResponse.SERVING
         except Exception:
             return False
 
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class _ProbeState:
+    def __init__(self):
+        self.ok: Optional[bool] = None
+        self.last_check: Optional[int] = None
+        self.last_success: Optional[int] = None
+        self.latency_ms: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def snapshot(self) -> Dict:
+        return {
+            "ok": self.ok,
+            "last_check": self.last_check,
+            "last_success": self.last_success,
+            "latency_ms": self.latency_ms,
+            "error": self.error
+        }
+
+class UpstreamProber:
+    """Checks upstream reachability on a fixed interval and caches the outcome.
+
+    Request handlers only ever read snapshot(), so health endpoints cost nothing upstream
+    no matter how often they are polled.
+    """
+
+    def __init__(self, checks: Dict[str, Callable[[], Awaitable[bool]]], interval: float = 15.0, timeout: float = 5.0):
+        self.checks = checks
+        self.interval = interval
+        self.timeout = timeout
+        self._states = {name: _ProbeState() for name in checks}
+        self._task: Optional[asyncio.Task] = None
+
+    async def _probe(self, name: str, check: Callable[[], Awaitable[bool]]):
+        state = self._states[name]
+        start = time.perf_counter()
+        try:
+            ok = bool(await asyncio.wait_for(check(), self.timeout))
+            state.error = None if ok else "check returned false"
+        except Exception as e:
+            ok = False
+            state.error = str(e) or type(e).__name__
+        now = int(time.time())
+        state.ok = ok
+        state.last_check = now
+        state.latency_ms = round((time.perf_counter() - start) * 1000, 1)
+        if ok:
+            state.last_success = now
+        else:
+            logger.warning(f"Upstream {name} probe failed: {state.error}")
+
+    async def probe_once(self):
+        await asyncio.gather(*(self._probe(name, check) for name, check in self.checks.items()))
+
+    async def _run(self):
+        while True:
+            await self.probe_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {name: state.snapshot() for name, state in self._states.items()}
@@ -0,0 +1,272 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+from . import budget
+from .budget import BudgetExhausted, FetchCancelled, TimeBudget
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+lease_outcomes = registry.counter("fetcher_lease_total", "Lease-guarded work by outcome (ran, shared, fresh, took_over, unleased)")
+lease_lost = registry.counter("fetcher_lease_lost_total", "Leases that could not be extended while their work was running")
+
+# Release/extend only when the lease still belongs to the caller, so a replica whose lease
+# expired can never drop or prolong the lease a different replica took over since.
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+return 0
+"""
+EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('PEXPIRE', KEYS[1], ARGV[2]) end
+return 0
+"""
+
+class RedisLeaseBackend:
+    """Leases shared by every replica pointing at the same Redis"""
+
+    def __init__(self, uri: str):
+        import redis.asyncio as redis
+        self.client = redis.from_url(uri, decode_responses=True)
+        self._release = self.client.register_script(RELEASE_SCRIPT)
+        self._extend = self.client.register_script(EXTEND_SCRIPT)
+
+    async def acquire(self, key: str, token: str, ttl_ms: int) -> bool:
+        return bool(await self.client.set(key, token, nx=True, px=ttl_ms))
+
+    async def extend(self, key: str, token: str, ttl_ms: int) -> bool:
+        return bool(await self._extend(keys=[key], args=[token, ttl_ms]))
+
+    async def release(self, key: str, token: str) -> bool:
+        return bool(await self._release(keys=[key], args=[token]))
+
+    async def holder(self, key: str) -> Optional[str]:
+        return await self.client.get(key)
+
+    async def set_result(self, key: str, value: str, ttl_seconds: int):
+        await self.client.set(key, value, ex=ttl_seconds)
+
+    async def get_result(self, key: str) -> Optional[str]:
+        return await self.client.get(key)
+
+    async def close(self):
+        await self.client.aclose()
+
+class MemoryLeaseBackend:
+    """Same contract as RedisLeaseBackend, scoped to this process (single replica, local runs)"""
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[str, float]] = {}
+
+    def _live(self, key: str) -> Optional[str]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._values[key]
+            return None
+        return entry[0]
+
+    async def acquire(self, key: str, token: str, ttl_ms: int) -> bool:
+        if self._live(key) is not None:
+            return False
+        self._values[key] = (token, time.monotonic() + ttl_ms / 1000)
+        return True
+
+    async def extend(self, key: str, token: str, ttl_ms: int) -> bool:
+        if self._live(key) != token:
+            return False
+        self._values[key] = (token, time.monotonic() + ttl_ms / 1000)
+        return True
+
+    async def release(self, key: str, token: str) -> bool:
+        if self._live(key) != token:
+            return False
+        del self._values[key]
+        return True
+
+    async def holder(self, key: str) -> Optional[str]:
+        return self._live(key)
+
+    async def set_result(self, key: str, value: str, ttl_seconds: int):
+        self._values[key] = (value, time.monotonic() + ttl_seconds)
+
+    async def get_result(self, key: str) -> Optional[str]:
+        return self._live(key)
+
+    async def close(self):
+        pass
+
+class LeaseManager:
+    """Makes sure only one replica runs a given unit of work (a season or round sync) at a time.
+
+    The first caller takes the lease (SET NX with a TTL), keeps it alive with a heartbeat
+    while the work runs and publishes the outcome, result or HTTP error, under the lease's
+    token. Callers that find the lease taken poll for that outcome instead of repeating the
+    work. A waiter only takes over when the lease lapses with nothing published (the holder
+    crashed, ran out of budget or was cancelled by its caller). If the backend itself is
+    unreachable the work runs unleased rather than failing.
+    """
+
+    def __init__(self, backend, ttl: float = 30.0, result_ttl: int = 120, wait_poll: float = 0.5, prefix: str = "fetcher"):
+        self.backend = backend
+        self.ttl = ttl
+        self.ttl_ms = int(ttl * 1000)
+        self.result_ttl = result_ttl
+        self.wait_poll = wait_poll
+        self.prefix = prefix
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    @classmethod
+    def from_settings(cls, settings) -> "LeaseManager":
+        backend = RedisLeaseBackend(settings.LEASE_URI) if settings.LEASE_URI else MemoryLeaseBackend()
+        return cls(
+            backend,
+            ttl=settings.LEASE_TTL_SECONDS,
+            result_ttl=settings.LEASE_RESULT_TTL_SECONDS,
+            wait_poll=settings.LEASE_WAIT_POLL_SECONDS
+        )
+
+    def _keys(self, unit: str) -> Tuple[str, str]:
+        return f"{self.prefix}:lease:{unit}", f"{self.prefix}:result:{unit}"
+
+    async def _heartbeat(self, key: str, token: str, work: asyncio.Task, fetch_budget: Optional[TimeBudget]) -> bool:
+        interval = self.ttl / 3
+        retry = min(1.0, self.ttl / 10)
+        expires = time.monotonic() + self.ttl
+        delay = interval
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                extended = await self.backend.extend(key, token, self.ttl_ms)
+            except Exception as e:
+                # Keep retrying while the lease is still ours on the backend's clock
+                if time.monotonic() + retry < expires:
+                    logger.warning(f"Could not extend lease {key}, retrying: {e}")
+                    delay = retry
+                    continue
+                extended = False
+            if extended:
+                expires = time.monotonic() + self.ttl
+                delay = interval
+                continue
+
+            lease_lost.inc()
+            logger.warning(f"Lost lease {key} while its work was still running, cancelling it")
+            if fetch_budget is not None:
+                await asyncio.to_thread(fetch_budget.token.cancel, "lease lost")
+            work.cancel()
+            return True
+
+    async def _publish(self, result_key: str, token: str, outcome: Dict):
+        try:
+            stored = dict(outcome, token=token, at=time.time())
+            await self.backend.set_result(result_key, json.dumps(stored), self.result_ttl)
+        except Exception as e:
+            logger.warning(f"Could not publish {result_key}: {e}")
+
+    async def _run(self, key: str, result_key: str, token: str, work: Callable[[], Awaitable[Dict]]) -> Dict:
+        task = asyncio.create_task(work())
+        heartbeat = asyncio.create_task(self._heartbeat(key, token, task, budget.current()))
+        try:
+            result = await task
+        except (asyncio.CancelledError, FetchCancelled):
+            if heartbeat.done() and not heartbeat.cancelled() and heartbeat.result():
+                raise HTTPException(status_code=503, detail=f"Lease {key} was lost before the fetch finished")
+            # Specific to this caller: publish nothing so a waiter takes over
+            raise
+        except HTTPException as e:
+            await self._publish(result_key, token, {"error": {"status": e.status_code, "detail": e.detail}})
+            raise
+        except BudgetExhausted:
+            raise
+        except Exception as e:
+            await self._publish(result_key, token, {"error": {"status": 500, "detail": str(e)}})
+            raise
+        else:
+            await self._publish(result_key, token, {"result": result})
+            return result
+        finally:
+            heartbeat.cancel()
+            try:
+                await self.backend.release(key, token)
+            except Exception as e:
+                logger.warning(f"Could not release lease {key}, it will expire: {e}")
+
+    async def _published(self, result_key: str) -> Optional[Dict]:
+        raw = await self.backend.get_result(result_key)
+        return json.loads(raw) if raw is not None else None
+
+    async def _wait(self, key: str, result_key: str, holder: str) -> Optional[Dict]:
+        """Outcome the holder published, or None once its lease is gone without one"""
+        while True:
+            await asyncio.sleep(self.wait_poll)
+            budget.check()
+            stored = await self._published(result_key)
+            if stored is not None and stored.get("token") == holder:
+                return stored
+            if await self.backend.holder(key) != holder:
+                stored = await self._published(result_key)
+                return stored if stored is not None and stored.get("token") == holder else None
+
+    @staticmethod
+    def _outcome(stored: Dict) -> Dict:
+        if "error" in stored:
+            raise HTTPException(status_code=stored["error"]["status"], detail=stored["error"]["detail"])
+        return stored["result"]
+
+    async def _unleased(self, unit: str, work: Callable[[], Awaitable[Dict]], error: Exception) -> Dict:
+        lease_outcomes.inc(outcome="unleased")
+        logger.warning(f"Lease backend unavailable, fetching {unit} without a lease: {error}")
+        return await work()
+
+    async def run_once(self, unit: str, work: Callable[[], Awaitable[Dict]], fresh_for: float = 0) -> Dict:
+        """Run work under the lease for unit, or wait for the replica holding it and return its outcome.
+
+        With fresh_for, a successful result any replica published less than that many seconds
+        ago is returned without running anything.
+        """
+        key, result_key = self._keys(unit)
+        took_over = False
+        while True:
+            budget.check()
+            token = f"{self.owner}:{uuid.uuid4().hex}"
+            try:
+                if fresh_for > 0:
+                    stored = await self._published(result_key)
+                    if stored is not None and "result" in stored and time.time() - stored["at"] < fresh_for:
+                        lease_outcomes.inc(outcome="fresh")
+                        return stored["result"]
+                acquired = await self.backend.acquire(key, token, self.ttl_ms)
+                holder = None if acquired else await self.backend.holder(key)
+            except Exception as e:
+                return await self._unleased(unit, work, e)
+
+            if acquired:
+                lease_outcomes.inc(outcome="took_over" if took_over else "ran")
+                return await self._run(key, result_key, token, work)
+            if holder is None:
+                continue
+
+            logger.info(f"{unit} is being fetched by {holder.rsplit(':', 1)[0]}, waiting for its result")
+            try:
+                stored = await self._wait(key, result_key, holder)
+            except (BudgetExhausted, FetchCancelled):
+                raise
+            except Exception as e:
+                return await self._unleased(unit, work, e)
+            if stored is None:
+                took_over = True
+                continue
+            lease_outcomes.inc(outcome="shared")
+            return self._outcome(stored)
+
+    async def close(self):
+        await self.backend.close()
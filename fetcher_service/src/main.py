@@ -1,30 +1,118 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from contextlib import asynccontextmanager
 import logging
 import asyncio
+import time
 from datetime import datetime
 
+from .archive import CaptureMissing, throttled
 from .config import settings
-from .scrapers.ergast import ErgastClient
-from .scrapers.f1_website import F1WebsiteClient
-from .grpc_client.data_scheduler_client import DataSchedulerClient
-from protobuf.gen.python import content_pb2
+from .budget import BudgetExhausted, FetchCancelled, TimeBudget, run_cancellable
+from .clients import Clients
+from .health import UpstreamProber
+from .planner import RefreshPlanner
+from .scrapers.selenium_pool import PRIORITY_CLASSES, render_context
+from .metrics import registry
+from .workers import LoopLagMonitor
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="WIBM fetcher_service", version="0.1.0")
+clients = Clients(settings)
+loop_lag = LoopLagMonitor(settings.LOOP_LAG_INTERVAL_SECONDS)
+started_at = time.monotonic()
 
-ergast = ErgastClient(settings.ERGAST_API_URL)
-scheduler = DataSchedulerClient(settings.DATA_SCHEDULER_URI)
-f1_website = F1WebsiteClient(scheduler_client=scheduler)
+async def _probe_ergast() -> bool:
+    return await clients.ergast.health()
+
+async def _probe_scheduler() -> bool:
+    return await asyncio.to_thread(clients.scheduler.health, settings.HEALTH_PROBE_TIMEOUT_SECONDS)
+
+prober = UpstreamProber(
+    {"ergast": _probe_ergast, "scheduler": _probe_scheduler},
+    interval=settings.HEALTH_PROBE_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS
+)
+
+async def _load_stored_rounds(season: int):
+    from .grpc_client.data_scheduler_client import ROUND_SCHEDULE_FIELDS
+    response = await asyncio.to_thread(clients.scheduler.get_rounds, season, None, ROUND_SCHEDULE_FIELDS)
+    return list(response.data.rounds)
+
+async def _never_disconnected() -> bool:
+    return False
+
+def _rounds_unit(season: int, round: int = None, live: str = None, force: bool = False) -> str:
+    unit = f"rounds:{season}:{round if round is not None else 'all'}"
+    if live:
+        unit = f"{unit}:{live}"
+    return f"{unit}:force" if force else unit
+
+def _capture_throttle(live: str = None):
+    """Live polls archive a page at most once per ARCHIVE_LIVE_MIN_INTERVAL_SECONDS"""
+    return throttled(settings.ARCHIVE_LIVE_MIN_INTERVAL_SECONDS if live else 0.0)
+
+async def _leased(unit: str, work, fresh_for: float = 0):
+    """Run work once across replicas; the others get the result of whichever took the lease"""
+    return await clients.leases.run_once(unit, work, fresh_for)
+
+async def _planned_refresh(season: int, round_id: int, live: str = None):
+    fetch_budget = TimeBudget(settings.FETCH_ROUND_BUDGET_SECONDS, f"planned refresh of round {round_id}")
+    with render_context("live" if live else "round"), _capture_throttle(live):
+        work = lambda: sync_rounds(clients.f1_website, season, round_id, live)
+        # Every replica runs a planner: a result another replica got within the last poll
+        # interval is taken as this poll's, so upstream load stays flat as replicas are added
+        leased = _leased(_rounds_unit(season, round_id, live), work, fresh_for=settings.PLANNER_LIVE_POLL_SECONDS)
+        return await run_cancellable(fetch_budget, leased, _never_disconnected)
+
+planner = RefreshPlanner.from_settings(settings, _load_stored_rounds, _planned_refresh)
+
+async def _start_background():
+    await asyncio.to_thread(clients.warm_up)
+    prober.start()
+    if settings.PLANNER_ENABLED:
+        planner.start()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    loop_lag.start()
+    # Warm up in the background so uvicorn starts accepting (liveness) requests immediately
+    background = asyncio.create_task(_start_background())
+    yield
+    await background
+    await planner.stop()
+    await prober.stop()
+    await loop_lag.stop()
+    leases = clients.created("leases")
+    if leases is not None:
+        await leases.close()
+    clients.close()
+
+app = FastAPI(title="WIBM fetcher_service", version="0.1.0", lifespan=lifespan)
 
 @app.get("/")
 async def root():
     return {"service": "fetcher_service", "status": "running"}
 
+async def _run_fetch(request: Request, fetch_budget: TimeBudget, coro):
+    """Run a fetch under its time budget, cancelling it if the caller goes away"""
+    try:
+        return await run_cancellable(fetch_budget, coro, request.is_disconnected, settings.DISCONNECT_POLL_SECONDS)
+    except BudgetExhausted as e:
+        logger.error(f"Fetch aborted: {e}")
+        raise HTTPException(status_code=504, detail=str(e))
+    except FetchCancelled as e:
+        logger.info(f"Fetch aborted: {e}")
+        raise HTTPException(status_code=499, detail=str(e))
+
 @app.post("/fetch/seasons")
-async def fetch_seasons():
+async def fetch_seasons(request: Request, force: bool = False, timeout: float = None):
+    fetch_budget = TimeBudget(timeout or settings.FETCH_SEASONS_BUDGET_SECONDS, "seasons fetch")
+    work = lambda: sync_seasons(clients.ergast, force)
+    return await _run_fetch(request, fetch_budget, _leased("seasons:force" if force else "seasons", work))
+
+async def sync_seasons(ergast, force: bool = False, source: str = "ergast"):
     try:
         logger.info("Fetching seasons from ergast")
 
@@ -40,7 +128,9 @@ async def fetch_seasons():
                 logger.info(f"Fetching details for season {year}")
                 details = await ergast.fetch_season_details(year)
                 details_map[year] = details
-                await asyncio.sleep(1)
+                await ergast.source.pause(1)
+            except (BudgetExhausted, FetchCancelled, CaptureMissing):
+                raise
             except Exception as e:
                 logger.error(f"Failed to fetch details for season {year}: {e}")
                 failed_seasons.append(year)
@@ -54,27 +144,45 @@ async def fetch_seasons():
         logger.info(f"Fetched details for {len(details_map)} seasons")
 
         proto_seasons = ergast.to_proto(seasons_data, details_map)
-        response = scheduler.write_seasons(proto_seasons)
+        response = clients.scheduler.write_seasons(proto_seasons, force=force)
 
         if response.success:
-            logger.info(f"Synced {response.records_affected} seasons")
+            logger.info(f"Synced {response.records_affected} seasons ({response.records_skipped} unchanged)")
             return {
                 "success": True,
-                "source": "ergast",
+                "source": source,
                 "count": len(seasons_data),
+                "written": response.records_affected,
+                "skipped": response.records_skipped,
                 "timestamp": int(datetime.now().timestamp())
             }
         else:
             raise HTTPException(status_code=500, detail=response.message)
 
-    except HTTPException:
+    except (HTTPException, BudgetExhausted, FetchCancelled):
         raise
+    except CaptureMissing as e:
+        # Only raised when re-parsing from the archive
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Fetch error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/fetch/rounds")
-async def fetch_rounds(season: int, round: int = None, live: str = None):
+async def fetch_rounds(request: Request, season: int, round: int = None, live: str = None, force: bool = False,
+                       timeout: float = None, priority: str = None):
+    if priority is not None and priority not in PRIORITY_CLASSES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of {list(PRIORITY_CLASSES)}")
+    default = settings.FETCH_ROUND_BUDGET_SECONDS if round is not None else settings.FETCH_ROUNDS_BUDGET_SECONDS
+    fetch_budget = TimeBudget(timeout or default, f"rounds fetch for {season}")
+    if priority is None:
+        priority = "live" if live else ("round" if round is not None else "season")
+    with render_context(priority), _capture_throttle(live):
+        work = lambda: sync_rounds(clients.f1_website, season, round, live, force)
+        return await _run_fetch(request, fetch_budget, _leased(_rounds_unit(season, round, live, force), work))
+
+async def sync_rounds(f1_website, season: int, round: int = None, live: str = None, force: bool = False,
+                      source: str = "f1_website"):
     try:
         if live and round is None:
             raise HTTPException(status_code=400, detail="live parameter requires round parameter")
@@ -98,6 +206,8 @@ async def fetch_rounds(season: int, round: int = None, live: str = None):
                     detail="Failed to fetch all rounds (all-or-nothing strategy)"
                 )
 
+        from protobuf.gen.python import content_pb2
+
         proto_rounds = []
         for round_data in rounds_data:
             circuit_proto = content_pb2.Circuit(
@@ -142,40 +252,89 @@ async def fetch_rounds(season: int, round: int = None, live: str = None):
             ))
 
         rounds_proto_data = content_pb2.RoundsData(rounds=proto_rounds)
-        response = scheduler.write_rounds(rounds_proto_data)
+        response = clients.scheduler.write_rounds(rounds_proto_data, force=force)
 
         if response.success:
-            logger.info(f"Synced {response.records_affected} rounds")
+            logger.info(f"Synced {response.records_affected} rounds ({response.records_skipped} unchanged)")
             return {
                 "success": True,
-                "source": "f1_website",
+                "source": source,
                 "count": len(rounds_data),
+                "written": response.records_affected,
+                "skipped": response.records_skipped,
                 "timestamp": int(datetime.now().timestamp())
             }
         else:
             raise HTTPException(status_code=500, detail=response.message)
 
-    except HTTPException:
+    except (HTTPException, BudgetExhausted, FetchCancelled):
         raise
+    except CaptureMissing as e:
+        # Only raised when re-parsing from the archive
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Fetch rounds error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/status")
 async def status():
+    upstreams = prober.snapshot()
+    f1_website = clients.created("f1_website")
+    guard = clients.created("guard")
+
+    return {
+        "status": "ready" if clients.ready else "starting",
+        "ergast": bool(upstreams["ergast"]["ok"]),
+        "scheduler": bool(upstreams["scheduler"]["ok"]),
+        "upstreams": upstreams,
+        "selenium": f1_website.selenium_pool.snapshot() if f1_website else [],
+        "render_queue": f1_website.selenium_pool.queue_snapshot() if f1_website else {},
+        "circuits": guard.snapshot() if guard else {},
+        "timestamp": int(datetime.now().timestamp())
+    }
+
+@app.get("/planner/timeline")
+async def planner_timeline(reload: bool = False):
     try:
-        ergast_ok = await ergast.health()
-        scheduler_ok = scheduler.health()
-
-        return {
-            "status": "ready",
-            "ergast": ergast_ok,
-            "scheduler": scheduler_ok,
-            "timestamp": int(datetime.now().timestamp())
-        }
+        await planner.ensure_timeline(force=reload)
     except Exception as e:
-        return JSONResponse(status_code=503, content={"status": "error", "message": str(e)})
+        logger.error(f"Planner timeline error: {e}")
+        raise HTTPException(status_code=503, detail=f"Could not load stored rounds: {e}")
+    return planner.timeline()
+
+@app.post("/reparse/seasons")
+async def reparse_seasons(at: float = None, force: bool = False):
+    ergast, _ = _replay_clients(at)
+    return await sync_seasons(ergast, force, source="archive")
+
+@app.post("/reparse/rounds")
+async def reparse_rounds(season: int, round: int = None, at: float = None, force: bool = False):
+    _, f1_website = _replay_clients(at)
+    return await sync_rounds(f1_website, season, round, force=force, source="archive")
+
+def _replay_clients(at: float = None):
+    try:
+        return clients.replay_clients(at)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@app.get("/archive/stats")
+async def archive_stats():
+    archive = clients.archive
+    if archive is None:
+        raise HTTPException(status_code=404, detail="Capture archive is disabled")
+    return await asyncio.to_thread(archive.stats)
+
+@app.get("/livez")
+async def livez():
+    return {"status": "alive", "uptime": round(time.monotonic() - started_at, 3)}
+
+@app.get("/readyz")
+async def readyz():
+    if not clients.ready:
+        return JSONResponse(status_code=503, content={"status": "starting", "error": clients.warmup_error})
+    return {"status": "ready", "warmup_seconds": round(clients.warmup_seconds, 3)}
 
-@app.on_event("shutdown")
-async def shutdown():
-    scheduler.close()
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return registry.render()
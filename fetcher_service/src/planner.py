@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from .timeline import SessionWindow, build_timeline, live_window
+
+logger = logging.getLogger(__name__)
+
+class RefreshPlanner:
+    """Schedules round refreshes from the session calendar instead of a fixed cron.
+
+    - while a session is inside its live window (start .. expected end + live_grace), the
+      round is refreshed every live_poll seconds with that session forced live;
+    - once a session has ended, a single refresh runs settle seconds later so the
+      published classification is picked up;
+    - otherwise the loop sleeps until the next of those events.
+    """
+
+    def __init__(self, load_rounds: Callable[[int], Awaitable[list]],
+                 refresh: Callable[[int, int, Optional[str]], Awaitable[Dict]],
+                 season: int = 0, settle: int = 900, live_poll: int = 60, live_grace: int = 900,
+                 catchup: int = 6 * 3600, reload_interval: int = 3600, max_sleep: int = 300):
+        self.load_rounds = load_rounds
+        self.refresh = refresh
+        self._season = season
+        self.settle = settle
+        self.live_poll = live_poll
+        self.live_grace = live_grace
+        self.catchup = catchup
+        self.reload_interval = reload_interval
+        self.max_sleep = max_sleep
+        self.windows: List[SessionWindow] = []
+        self.loaded_at: Optional[int] = None
+        self.last_action: Optional[Dict] = None
+        self._done: Set[Tuple[int, int, str]] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._load_lock = asyncio.Lock()
+
+    @classmethod
+    def from_settings(cls, settings, load_rounds, refresh) -> "RefreshPlanner":
+        return cls(
+            load_rounds, refresh,
+            season=settings.PLANNER_SEASON,
+            settle=settings.PLANNER_SETTLE_SECONDS,
+            live_poll=settings.PLANNER_LIVE_POLL_SECONDS,
+            live_grace=settings.PLANNER_LIVE_GRACE_SECONDS,
+            catchup=settings.PLANNER_CATCHUP_SECONDS,
+            reload_interval=settings.PLANNER_RELOAD_SECONDS
+        )
+
+    @property
+    def season(self) -> int:
+        return self._season or datetime.now().year
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def ensure_timeline(self, force: bool = False) -> List[SessionWindow]:
+        async with self._load_lock:
+            now = int(time.time())
+            if force or self.loaded_at is None or now - self.loaded_at >= self.reload_interval:
+                rounds = await self.load_rounds(self.season)
+                self.windows = build_timeline(rounds)
+                self.loaded_at = now
+                logger.info(f"Planner loaded {len(self.windows)} sessions for season {self.season}")
+        return self.windows
+
+    def _refresh_at(self, window: SessionWindow) -> int:
+        return window.end + self.settle
+
+    def _pending_refreshes(self, now: int) -> List[SessionWindow]:
+        return [
+            w for w in self.windows
+            if (w.season, w.round_id, w.session_type) not in self._done
+            and now - self.catchup <= self._refresh_at(w)
+        ]
+
+    def next_action(self, now: int) -> Dict:
+        live = live_window(self.windows, now, self.live_grace)
+        if live:
+            return {"kind": "live_poll", "at": now, "session": live.to_dict()}
+
+        pending = self._pending_refreshes(now)
+        if pending:
+            window = min(pending, key=self._refresh_at)
+            return {"kind": "post_session_refresh", "at": self._refresh_at(window), "session": window.to_dict()}
+
+        upcoming = [w for w in self.windows if w.start > now]
+        if upcoming:
+            return {"kind": "session_start", "at": upcoming[0].start, "session": upcoming[0].to_dict()}
+        return {"kind": "idle", "at": now + self.reload_interval, "session": None}
+
+    async def _execute(self, action: Dict):
+        session = action["session"]
+        live = session["type"] if action["kind"] == "live_poll" else None
+        logger.info(f"Planner {action['kind']}: season {session['season']} round {session['round_id']} ({session['type']})")
+        try:
+            result = await self.refresh(session["season"], session["round_id"], live)
+            self.last_action = {**action, "finished_at": int(time.time()), "ok": True, "result": result}
+        except Exception as e:
+            logger.error(f"Planner refresh failed for round {session['round_id']}: {e}")
+            self.last_action = {**action, "finished_at": int(time.time()), "ok": False, "error": str(e)}
+            return False
+        return True
+
+    async def _tick(self) -> float:
+        """Run whatever is due and return how long to sleep before the next tick"""
+        try:
+            await self.ensure_timeline()
+        except Exception as e:
+            logger.error(f"Planner could not load timeline: {e}")
+            return self.max_sleep
+
+        now = int(time.time())
+        action = self.next_action(now)
+
+        if action["kind"] == "live_poll":
+            await self._execute(action)
+            return self.live_poll
+
+        if action["kind"] == "post_session_refresh" and action["at"] <= now:
+            session = action["session"]
+            if await self._execute(action):
+                self._done.add((session["season"], session["round_id"], session["type"]))
+                # Session dates can move after a refresh (red flags, reschedules)
+                try:
+                    await self.ensure_timeline(force=True)
+                except Exception as e:
+                    logger.error(f"Planner could not reload timeline: {e}")
+                    return self.max_sleep
+                return 0
+            return min(self.live_poll, self.max_sleep)
+
+        next_start = min((w.start for w in self.windows if w.start > now), default=action["at"])
+        return max(1, min(action["at"] - now, next_start - now, self.max_sleep))
+
+    async def _run(self):
+        while True:
+            try:
+                delay = await self._tick()
+            except Exception as e:
+                logger.error(f"Planner tick failed: {e}")
+                delay = self.max_sleep
+            await asyncio.sleep(delay)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def timeline(self, now: int = None) -> Dict:
+        now = now or int(time.time())
+        sessions = []
+        for w in self.windows:
+            if w.contains(now, self.live_grace):
+                state = "live"
+            elif (w.season, w.round_id, w.session_type) in self._done:
+                state = "refreshed"
+            elif now < w.start:
+                state = "upcoming"
+            else:
+                state = "awaiting_refresh" if now - self.catchup <= self._refresh_at(w) else "past"
+            sessions.append({**w.to_dict(), "state": state, "refresh_at": self._refresh_at(w)})
+
+        return {
+            "season": self.season,
+            "running": self.running,
+            "loaded_at": self.loaded_at,
+            "next_action": self.next_action(now),
+            "last_action": self.last_action,
+            "sessions": sessions
+        }
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+upstream_seconds = registry.histogram("fetcher_upstream_seconds", "Latency of upstream GETs that returned a response")
+hedges_fired = registry.counter("fetcher_hedges_fired_total", "Hedge requests sent after the primary passed the latency threshold")
+hedges_won = registry.counter("fetcher_hedges_won_total", "Hedge requests that answered before the primary")
+breaker_state = registry.gauge("fetcher_circuit_state", "Circuit breaker state per host (0 closed, 1 half-open, 2 open)")
+short_circuits = registry.counter("fetcher_circuit_short_circuits_total", "Requests rejected because the host circuit was open")
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+class CircuitOpen(Exception):
+    pass
+
+class LatencyTracker:
+    """Sliding window of recent response times for one host"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one host.
+
+    After failure_threshold failures in a row the circuit opens and calls fail immediately.
+    Once reset_seconds have passed a single trial call is let through (half-open): success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        breaker_state.set(STATE_VALUES[CLOSED], host=host)
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            logger.warning(f"Circuit for {self.host} is now {state}")
+        self.state = state
+        breaker_state.set(STATE_VALUES[state], host=self.host)
+
+    def allow(self) -> bool:
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self._set_state(HALF_OPEN)
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def abandon(self):
+        """The call let through was cancelled before it could report an outcome"""
+        self._trial_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self._trial_in_flight = False
+        self._set_state(CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    def snapshot(self) -> Dict:
+        return {"state": self.state, "failures": self.failures}
+
+class UpstreamGuard:
+    """Per-host hedging and circuit breaking for idempotent GETs.
+
+    Once a host has hedge_min_samples latencies on record, a request still unanswered after the
+    host's hedge_percentile latency gets a duplicate; whichever answers first wins and the
+    other is cancelled. Transport errors and 5xx responses count as breaker failures.
+    Used from the event loop only.
+    """
+
+    def __init__(self, hedge_enabled: bool = True, hedge_percentile: float = 95.0, hedge_min_samples: int = 20,
+                 failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> "UpstreamGuard":
+        return cls(
+            hedge_enabled=settings.HEDGE_ENABLED,
+            hedge_percentile=settings.HEDGE_PERCENTILE,
+            hedge_min_samples=settings.HEDGE_MIN_SAMPLES,
+            failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+            reset_seconds=settings.BREAKER_RESET_SECONDS
+        )
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(host, self.failure_threshold, self.reset_seconds)
+        return self._breakers[host]
+
+    def latency(self, host: str) -> LatencyTracker:
+        return self._latency.setdefault(host, LatencyTracker())
+
+    def hedge_delay(self, host: str) -> Optional[float]:
+        tracker = self.latency(host)
+        if not self.hedge_enabled or len(tracker) < self.hedge_min_samples:
+            return None
+        return tracker.percentile(self.hedge_percentile)
+
+    async def _timed_get(self, client, url: str):
+        start = time.perf_counter()
+        response = await client.get(url)
+        return response, time.perf_counter() - start
+
+    async def _hedged_get(self, client, url: str, host: str):
+        primary = asyncio.ensure_future(self._timed_get(client, url))
+        hedge = None
+        try:
+            delay = self.hedge_delay(host)
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+
+            hedges_fired.inc(host=host)
+            hedge = asyncio.ensure_future(self._timed_get(client, url))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            hedges_won.inc(host=host)
+                        return task.result()
+            # Both attempts failed: surface the primary's error
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def get(self, client, url: str):
+        """GET through the host's breaker, hedging slow responses; raises CircuitOpen when open"""
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            short_circuits.inc(host=host)
+            raise CircuitOpen(f"Circuit open for {host}, not requesting {url}")
+
+        try:
+            response, elapsed = await self._hedged_get(client, url, host)
+        except asyncio.CancelledError:
+            breaker.abandon()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            self.latency(host).record(elapsed)
+            upstream_seconds.observe(elapsed, host=host)
+        return response
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {
+            host: {**breaker.snapshot(), "samples": len(self.latency(host)), "hedge_after": self.hedge_delay(host)}
+            for host, breaker in self._breakers.items()
+        }
@@ -1,32 +1,54 @@
 import httpx
+import json
 import logging
 import asyncio
 from typing import List, Dict
 from datetime import datetime
+from .. import budget
+from ..archive import CaptureSource
+from ..resilience import UpstreamGuard
 
 logger = logging.getLogger(__name__)
 
+# Session type -> (endpoint, key of the result list inside the race entry)
+SESSION_ENDPOINTS = {
+    "race": ("results", "Results"),
+    "qualifying": ("qualifying", "QualifyingResults"),
+    "sprint": ("sprint", "SprintResults")
+}
+
 class ErgastClient:
-    def __init__(self, url: str):
+    def __init__(self, url: str, source: CaptureSource = None, guard: UpstreamGuard = None):
         self.url = url
         self.timeout = 10.0
+        self.source = source or CaptureSource()
+        self.guard = guard or UpstreamGuard()
 
     async def fetch_seasons(self, start_year: int = 2010) -> List[Dict]:
         async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(f"{self.url}/seasons.json?limit=100")
-            response.raise_for_status()
-            seasons = response.json()["MRData"]["SeasonTable"]["Seasons"]
+            data = await self._get_json(client, f"{self.url}/seasons.json?limit=100", max_retries=1)
+            seasons = data["MRData"]["SeasonTable"]["Seasons"]
             return [s for s in seasons if int(s["season"]) >= start_year]
 
+    async def _get_json(self, client: httpx.AsyncClient, url: str, max_retries: int = 3):
+        body = self.source.replayed(url)
+        if body is None:
+            response = await self._fetch_with_retry(client, url, max_retries)
+            body = response.content
+            await self.source.capture_async(url, body, "ergast")
+        return json.loads(body)
+
     async def _fetch_with_retry(self, client: httpx.AsyncClient, url: str, max_retries: int = 3):
         for attempt in range(max_retries):
+            budget.check()
             try:
-                response = await client.get(url)
+                response = await self.guard.get(client, url)
                 response.raise_for_status()
                 return response
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 429 and attempt < max_retries - 1:
                     wait_time = 2 ** (attempt + 1)
+                    budget.ensure(wait_time)
                     logger.warning(f"Rate limited on {url}, retrying in {wait_time}s (attempt {attempt + 1}/{max_retries})")
                     await asyncio.sleep(wait_time)
                 else:
@@ -34,17 +56,17 @@ class ErgastClient:
 
     async def fetch_season_details(self, year: int, max_retries: int = 3) -> Dict:
         async with httpx.AsyncClient(timeout=self.timeout) as client:
-            driver_response = await self._fetch_with_retry(client, f"{self.url}/{year}/driverStandings.json", max_retries)
-            driver_data = driver_response.json()["MRData"]["StandingsTable"]["StandingsLists"]
-            await asyncio.sleep(0.5)
+            driver_json = await self._get_json(client, f"{self.url}/{year}/driverStandings.json", max_retries)
+            driver_data = driver_json["MRData"]["StandingsTable"]["StandingsLists"]
+            await self.source.pause(0.5)
 
-            constructor_response = await self._fetch_with_retry(client, f"{self.url}/{year}/constructorStandings.json", max_retries)
-            constructor_data = constructor_response.json()["MRData"]["StandingsTable"]["StandingsLists"]
-            await asyncio.sleep(0.5)
+            constructor_json = await self._get_json(client, f"{self.url}/{year}/constructorStandings.json", max_retries)
+            constructor_data = constructor_json["MRData"]["StandingsTable"]["StandingsLists"]
+            await self.source.pause(0.5)
 
-            races_response = await self._fetch_with_retry(client, f"{self.url}/{year}.json", max_retries)
-            races_data = races_response.json()["MRData"]["RaceTable"]["Races"]
-            await asyncio.sleep(0.5)
+            races_json = await self._get_json(client, f"{self.url}/{year}.json", max_retries)
+            races_data = races_json["MRData"]["RaceTable"]["Races"]
+            await self.source.pause(0.5)
 
             details = {
                 "driver_standings": [],
@@ -53,6 +75,8 @@ class ErgastClient:
                 "total_teams": 0,
                 "rounds": len(races_data),
                 "current_round": 0,
+                "remaining_races": 0,
+                "remaining_sprints": 0,
                 "start_date": None,
                 "end_date": None
             }
@@ -98,10 +122,21 @@ class ErgastClient:
                 else:
                     details["current_round"] = len(races_data)
 
+                # Count what is still to run from the round the standings were published for,
+                # not the calendar: a race that already ran but has no standings yet must still
+                # count as remaining, or its points go missing from the scenarios.
+                standings_round = int(driver_data[0].get("round", 0)) if driver_data else 0
+                details["remaining_races"] = max(0, len(races_data) - standings_round)
+                details["remaining_sprints"] = sum(
+                    1 for race in races_data
+                    if race.get("Sprint") and int(race.get("round", 0)) > standings_round
+                )
+
             return details
 
     def to_proto(self, seasons_data: List[Dict], details_map: Dict[int, Dict] = None):
         from protobuf.gen.python import content_pb2
+        from ..championship import championship_scenarios
 
         seasons = content_pb2.SeasonsData()
         for item in seasons_data:
@@ -127,6 +162,13 @@ class ErgastClient:
                     standing.points = ds["points"]
                     standing.wins = ds["wins"]
 
+                scenarios = championship_scenarios(
+                    details.get("driver_standings", []), year,
+                    details.get("remaining_races", 0), details.get("remaining_sprints", 0)
+                )
+                for scenario in scenarios:
+                    season.championship.add(**scenario)
+
                 for cs in details.get("constructor_standings", []):
                     standing = season.constructor_standings.add()
                     standing.position = cs["position"]
@@ -167,8 +209,8 @@ class ErgastClient:
         """Fetch circuit ID for a specific round from Ergast"""
         async with httpx.AsyncClient(timeout=self.timeout) as client:
             try:
-                response = await self._fetch_with_retry(client, f"{self.url}/{season}/{round_num}.json")
-                races = response.json()["MRData"]["RaceTable"]["Races"]
+                data = await self._get_json(client, f"{self.url}/{season}/{round_num}.json")
+                races = data["MRData"]["RaceTable"]["Races"]
 
                 if not races or len(races) == 0:
                     logger.warning(f"No circuit data found in Ergast for season {season} round {round_num}")
@@ -184,10 +226,59 @@ class ErgastClient:
                 logger.error(f"Failed to fetch circuit from Ergast for {season}/{round_num}: {e}")
                 return {}
 
+    async def fetch_session_results(self, season: int, round_num: int, session_type: str) -> List[Dict]:
+        """Classification of a race, qualifying or sprint, shaped like the scraped results tables.
+
+        Returns an empty list when Ergast has not published the session yet.
+        """
+        endpoint, key = SESSION_ENDPOINTS[session_type]
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            data = await self._get_json(client, f"{self.url}/{season}/{round_num}/{endpoint}.json?limit=100")
+        races = data["MRData"]["RaceTable"]["Races"]
+        if not races:
+            return []
+
+        entries = races[0].get(key, [])
+        winner_laps = int(entries[0].get("laps", 0)) if entries else 0
+        results = []
+        for entry in entries:
+            driver = entry.get("Driver", {})
+            if session_type == "qualifying":
+                # Matches the scraped table, whose time column is Q1
+                time = entry.get("Q1", "")
+                laps = 0
+            else:
+                laps = int(entry.get("laps", 0))
+                time = entry.get("Time", {}).get("time") or self._untimed(entry.get("positionText", ""), winner_laps - laps)
+
+            results.append({
+                "position": int(entry.get("position", 0)),
+                "driver_number": int(entry.get("number", 0)),
+                "driver_name": f"{driver.get('givenName', '')} {driver.get('familyName', '')}".strip(),
+                "driver_code": driver.get("code", ""),
+                "team": entry.get("Constructor", {}).get("name", ""),
+                "time": time,
+                "laps": laps
+            })
+        return results
+
+    @staticmethod
+    def _untimed(position_text: str, laps_down: int) -> str:
+        """Time column for a car without a finishing time, in formula1.com's words.
+
+        Classified cars (numeric positionText) are lapped: "+N lap(s)" from the winner's lap
+        count, whatever the status text says ("+1 Lap", "Lapped", ...).
+        """
+        if position_text.isdigit():
+            if laps_down <= 0:
+                return ""
+            return f"+{laps_down} lap" if laps_down == 1 else f"+{laps_down} laps"
+        return {"D": "DSQ", "E": "DSQ", "W": "DNS", "N": "NC", "F": "DNQ"}.get(position_text, "DNF")
+
     async def health(self) -> bool:
         try:
             async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.url}/current.json")
+                response = await client.get(f"{self.url}/current.json?limit=1")
                 return response.status_code == 200
         except Exception as e:
             logger.error(f"Health check failed: {e}")
@@ -2,25 +2,48 @@ import httpx
 import base64
 import logging
 import asyncio
-import re
-import os
 import json
-from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 from datetime import datetime
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from .. import budget
+from ..archive import CaptureSource
+from ..config import settings
+from ..grpc_client.data_scheduler_client import DRIVER_NUMBER_FIELDS, SEASON_ROUNDS_FIELDS
+from ..resilience import CircuitOpen, UpstreamGuard
+from ..timeline import SessionWindow, live_window
+from ..workers import ParsePool
+from . import parsing
+from .render_profile import RenderProfile
+from .results_source import ResultsSource, harmonize_names
+from .selenium_pool import SeleniumPool
 
 logger = logging.getLogger(__name__)
 
+# Share of a fetch's remaining budget planned for rendering the season schedule; each round
+# is then planned an equal share of whatever is left (time saved early carries forward, and
+# a slow round borrows from later ones; only the fetch's own deadline fails it).
+SCHEDULE_BUDGET_SHARE = 0.25
+
+# How far live timing's session start may be from the calendar's before SessionInfo.json is
+# taken to describe another session (e.g. the previous weekend's race)
+LIVE_TIMING_START_TOLERANCE_SECONDS = 3 * 3600
+
 class F1WebsiteClient:
-    def __init__(self, scheduler_client=None):
+    def __init__(self, scheduler_client=None, render_profile: RenderProfile = None, selenium_pool: SeleniumPool = None,
+                 parse_pool: ParsePool = None, source: CaptureSource = None, guard: UpstreamGuard = None,
+                 results_source: ResultsSource = None):
         self.base_url = "https://www.formula1.com"
         self.timeout = 30.0
         self.scheduler_client = scheduler_client
+        self.render_profile = render_profile or RenderProfile.from_settings(settings)
+        self.selenium_pool = selenium_pool or SeleniumPool.from_settings(settings)
+        self.parse_pool = parse_pool or ParsePool.from_settings(settings)
+        self.source = source or CaptureSource()
+        self.guard = guard or UpstreamGuard.from_settings(settings)
+        self.results_source = results_source
+        self._driver_nodes = {}
         self._driver_number_cache = {}
 
     def _fetch_driver_number_mapping(self, season: int) -> Dict[str, int]:
@@ -31,7 +54,7 @@ class F1WebsiteClient:
         if cache_key in self._driver_number_cache:
             return self._driver_number_cache[cache_key]
 
-        response = self.scheduler_client.get_seasons(year=season)
+        response = self.scheduler_client.get_seasons(year=season, fields=DRIVER_NUMBER_FIELDS)
 
         if not response.data.seasons:
             raise Exception(f"No season data found for {season}")
@@ -50,23 +73,68 @@ class F1WebsiteClient:
         logger.info(f"Loaded {len(mapping)} driver number mappings for season {season}")
         return mapping
 
+    def _expected_round_count(self, season: int) -> Optional[int]:
+        """Number of rounds the stored season (from Ergast) has, if known"""
+        if not self.scheduler_client:
+            return None
+        try:
+            response = self.scheduler_client.get_seasons(year=season, fields=SEASON_ROUNDS_FIELDS)
+        except Exception as e:
+            logger.warning(f"Could not load round count for season {season}: {e}")
+            return None
+        if not response.data.seasons:
+            return None
+        return response.data.seasons[0].rounds or None
+
     def _create_selenium_driver(self):
-        selenium_url = os.getenv('SELENIUM_URL', 'http://localhost:4444')
-        chrome_options = Options()
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        return webdriver.Remote(command_executor=selenium_url, options=chrome_options)
+        last_error = None
+        fetch_budget = budget.current()
+        for _ in range(len(self.selenium_pool.nodes)):
+            budget.check()
+            node = self.selenium_pool.acquire(budget.clamp(self.selenium_pool.acquire_timeout))
+            try:
+                driver = webdriver.Remote(command_executor=node.url, options=self.render_profile.chrome_options())
+            except Exception as e:
+                logger.warning(f"Failed to start browser session on {node.url}: {e}")
+                self.selenium_pool.release(node, failed=True)
+                last_error = e
+                continue
+            self._driver_nodes[id(driver)] = (node, fetch_budget.token if fetch_budget else None)
+            if fetch_budget:
+                # Cancelling the fetch quits the session from outside, which fails any
+                # blocking WebDriver call in the worker thread and frees the slot at once
+                driver.set_page_load_timeout(max(1.0, fetch_budget.remaining()))
+                fetch_budget.token.register(id(driver), lambda: self._quit_selenium_driver(driver))
+            return driver
+        raise Exception(f"No Selenium node could start a browser session: {last_error}")
+
+    def _quit_selenium_driver(self, driver):
+        entry = self._driver_nodes.pop(id(driver), None)
+        if entry is None:
+            # Already quit by a cancelled fetch
+            return
+        node, token = entry
+        if token:
+            token.unregister(id(driver))
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting browser session: {e}")
+        finally:
+            self.selenium_pool.release(node)
 
     def _fetch_schedule_with_selenium(self, season: int) -> List[Dict]:
+        url = f"{self.base_url}/en/racing/{season}"
+        archived = self.source.replayed(url)
+        if archived is not None:
+            return json.loads(archived)
+
+        expected = self._expected_round_count(season)
         driver = self._create_selenium_driver()
         try:
-            driver.get(f"{self.base_url}/en/racing/{season}")
+            driver.get(url)
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            WebDriverWait(driver, 20).until(lambda d: d.execute_script(f"""
-                return document.querySelectorAll('a[href*="/racing/{season}/"]').length >= 24 &&
-                       Array.from(document.querySelectorAll('a[href*="/racing/{season}/"]')).filter(card =>
-                           card.textContent.match(/ROUND\\s+\\d+/i)).length >= 24;
-            """))
+            self.render_profile.wait_until_ready(driver, 'schedule', season, expected=expected)
 
             rounds_data = driver.execute_script(f"""
                 const roundsMap = new Map();
@@ -85,12 +153,14 @@ class F1WebsiteClient:
                 return Array.from(roundsMap.values());
             """)
             rounds_data.sort(key=lambda x: x['round_id'])
+            self.source.capture(url, json.dumps(rounds_data).encode('utf-8'), "render_json")
             return rounds_data
         finally:
-            driver.quit()
+            self._quit_selenium_driver(driver)
 
     async def fetch_rounds_for_season(self, season: int, specific_round_id: int = None, force_live_session: str = None) -> List[Dict]:
-        rounds_metadata = await asyncio.to_thread(self._fetch_schedule_with_selenium, season)
+        with budget.stage(f"schedule {season}", SCHEDULE_BUDGET_SHARE):
+            rounds_metadata = await asyncio.to_thread(self._fetch_schedule_with_selenium, season)
 
         if specific_round_id is not None:
             rounds_metadata = [m for m in rounds_metadata if m['round_id'] == specific_round_id]
@@ -100,43 +170,32 @@ class F1WebsiteClient:
 
         async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
             all_rounds = []
-            for metadata in rounds_metadata:
+            for i, metadata in enumerate(rounds_metadata):
                 try:
-                    round_data = await self._fetch_round_details(client, season, metadata, force_live_session)
+                    budget.check()
+                    with budget.stage(f"round {metadata['round_id']}", 1 / (len(rounds_metadata) - i)):
+                        round_data = await self._fetch_round_details(client, season, metadata, force_live_session)
                     all_rounds.append(round_data)
-                    await asyncio.sleep(1)
+                    await self.source.pause(1)
                 except Exception as e:
                     logger.error(f"Failed to fetch round {metadata.get('name', 'Unknown')}: {e}")
                     raise
 
             return all_rounds
 
-    def _extract_round_name(self, soup: BeautifulSoup, season: int) -> Optional[str]:
-        for script in soup.find_all('script', type='application/ld+json'):
-            try:
-                data = json.loads(script.string)
-                if data.get('@type') == 'SportsEvent' and data.get('name'):
-                    name = re.sub(rf'\s*{season}$', '', data['name']).strip()
-                    name = re.sub(r'^FORMULA\s+1\s+', '', name, flags=re.IGNORECASE)
-                    return name
-            except:
-                pass
-        return None
-
     async def _fetch_round_details(self, client: httpx.AsyncClient, season: int, metadata: Dict, force_live_session: str = None) -> Dict:
         url = f"{self.base_url}/en/racing/{season}/{metadata['location']}"
-        html = await self._fetch_with_retry(client, url)
-        soup = BeautifulSoup(html, 'html.parser')
+        html = await self._get_page(client, url)
+        page = await self.parse_pool.run(parsing.parse_round_page, html, season)
 
-        round_name = self._extract_round_name(soup, season)
-        if round_name:
-            metadata['name'] = round_name
+        if page['round_name']:
+            metadata['name'] = page['round_name']
 
-        circuit = await self._extract_circuit_info(client, soup, season, metadata['location'])
+        circuit = await self._extract_circuit_info(client, page, metadata['location'])
 
-        sessions = await self._extract_sessions(client, season, metadata['location'], soup, force_live_session)
+        sessions = await self._extract_sessions(client, season, metadata['round_id'], metadata['location'], page, force_live_session)
 
-        first_date, end_date = self._extract_weekend_dates(soup, season)
+        first_date, end_date = page['first_date'], page['end_date']
 
         if not metadata['name'] or not metadata['name'].strip():
             raise Exception("Round name is empty or invalid")
@@ -160,28 +219,15 @@ class F1WebsiteClient:
             'sessions': sessions
         }
 
-    async def _extract_circuit_info(self, client: httpx.AsyncClient, soup: BeautifulSoup, season: int, location: str) -> Dict:
+    async def _extract_circuit_info(self, client: httpx.AsyncClient, page: Dict, location: str) -> Dict:
         circuit = {
-            'name': '',
-            'laps': 0,
+            'name': page['circuit_name'],
+            'laps': page['laps'],
             'image_base64': ''
         }
 
-        for script in soup.find_all('script', type='application/ld+json'):
-            try:
-                data = json.loads(script.string)
-                if data.get('@type') != 'SportsEvent':
-                    continue
-
-                location_data = data.get('location', {})
-                if not circuit['name'] and location_data.get('name'):
-                    circuit['name'] = location_data['name']
-            except:
-                pass
-
-        img = soup.select_one('img[src*="/track/"], img[src*="Circuit"], img[src*="circuit"], img[alt*="circuit"], img[alt*="Circuit"]')
-        if img and img.get('src'):
-            image_url = img['src']
+        if page['circuit_image_src']:
+            image_url = page['circuit_image_src']
             if not image_url.startswith('http'):
                 image_url = self.base_url + image_url
             try:
@@ -193,153 +239,60 @@ class F1WebsiteClient:
             logger.error(f"No circuit image element found in HTML for {location}")
             raise Exception(f"No circuit image element found for {location}")
 
-        dt_elem = soup.find('dt', text=re.compile(r'Number\s+of\s+Laps', re.IGNORECASE))
-        if dt_elem:
-            dd_elem = dt_elem.find_next_sibling('dd')
-            if dd_elem:
-                laps_text = dd_elem.get_text().strip()
-                match = re.search(r'(\d+)', laps_text)
-                if match:
-                    circuit['laps'] = int(match.group(1))
-
         return circuit
 
     async def _download_image_as_base64(self, client: httpx.AsyncClient, url: str) -> str:
-        response = await client.get(url)
-        response.raise_for_status()
-        return base64.b64encode(response.content).decode('utf-8')
-
-    def _extract_weekend_dates(self, soup: BeautifulSoup, season: int) -> tuple:
-        for script in soup.find_all('script', type='application/ld+json'):
-            try:
-                data = json.loads(script.string)
-                if data.get('@type') == 'SportsEvent' and data.get('startDate') and data.get('endDate'):
-                    start_dt = datetime.fromisoformat(data['startDate'].replace('Z', '+00:00'))
-                    end_dt = datetime.fromisoformat(data['endDate'].replace('Z', '+00:00'))
-                    return int(start_dt.timestamp()), int(end_dt.timestamp())
-            except:
-                pass
-        return 0, 0
+        content = self.source.replayed(url)
+        if content is None:
+            response = await client.get(url)
+            response.raise_for_status()
+            content = response.content
+            await self.source.capture_async(url, content, "http")
+        return base64.b64encode(content).decode('utf-8')
+
+    async def _get_page(self, client: httpx.AsyncClient, url: str) -> str:
+        archived = self.source.replayed(url)
+        if archived is not None:
+            return archived.decode('utf-8')
+        html = await self._fetch_with_retry(client, url)
+        await self.source.capture_async(url, html.encode('utf-8'), "http")
+        return html
 
     def _extract_all_session_dates_sync(self, season: int, location: str) -> Dict[str, int]:
+        url = f"{self.base_url}/en/racing/{season}/{location}"
+        archived = self.source.replayed(url + "#rendered")
+        if archived is not None:
+            return self.parse_pool.run_sync(parsing.parse_session_dates, archived.decode('utf-8'))
+
         driver = self._create_selenium_driver()
         try:
-            driver.get(f"{self.base_url}/en/racing/{season}/{location}")
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.TAG_NAME, "script"))
-            )
-
-            soup = BeautifulSoup(driver.page_source, 'lxml')
-            session_dates = {}
-            session_map = {
-                'practice 1': 'practice_1',
-                'practice 2': 'practice_2',
-                'practice 3': 'practice_3',
-                'qualifying': 'qualifying',
-                'sprint qualifying': 'sprint_qualifying',
-                'sprint': 'sprint',
-                'race': 'race'
-            }
-
-            for script in soup.find_all('script'):
-                if not script.string or '"@type":"SportsEvent"' not in script.string:
-                    continue
-
-                start = 0
-                while True:
-                    event_start = script.string.find('"@type":"SportsEvent"', start)
-                    if event_start == -1:
-                        break
-
-                    brace_start = script.string.rfind('{', 0, event_start)
-                    if brace_start == -1:
-                        break
-
-                    brace_count = 1
-                    pos = brace_start + 1
-                    while pos < len(script.string) and brace_count > 0:
-                        if script.string[pos] == '{':
-                            brace_count += 1
-                        elif script.string[pos] == '}':
-                            brace_count -= 1
-                        pos += 1
-
-                    if brace_count == 0:
-                        try:
-                            event_data = json.loads(script.string[brace_start:pos])
-                            if not (event_data.get('@type') == 'SportsEvent' and event_data.get('name') and event_data.get('startDate')):
-                                continue
-
-                            name_lower = event_data['name'].lower()
-                            session_type = self._detect_session_type(name_lower, session_map)
-
-                            if session_type and session_type not in session_dates:
-                                date_str = event_data['startDate'].replace('Z', '+00:00')
-                                session_dates[session_type] = int(datetime.fromisoformat(date_str).timestamp())
-                        except:
-                            pass
-                    start = event_start + 1
-            return session_dates
+            driver.get(url)
+            try:
+                self.render_profile.wait_until_ready(driver, 'event')
+            except TimeoutException:
+                budget.check()
+                logger.warning(f"No SportsEvent data rendered for {season}/{location}, parsing page as-is")
+            html = driver.page_source
         finally:
-            driver.quit()
-
-    def _detect_session_type(self, name_lower: str, session_map: Dict[str, str]) -> Optional[str]:
-        for key, type_val in session_map.items():
-            if key not in name_lower:
-                continue
-
-            if key == 'sprint' and 'qualifying' in name_lower:
-                return 'sprint_qualifying'
-            elif key == 'qualifying' and 'sprint' in name_lower:
-                continue
-            else:
-                return type_val
-        return None
-
-    def _detect_live_session_from_html(self, soup: BeautifulSoup) -> Optional[str]:
-        session_text_map = {
-            'practice 1': 'practice_1',
-            'practice 2': 'practice_2',
-            'practice 3': 'practice_3',
-            'qualifying': 'qualifying',
-            'sprint qualifying': 'sprint_qualifying',
-            'sprint': 'sprint',
-            'race': 'race'
-        }
-
-        # Search for multiple live indicators: "Live Timing", "Live", "LIVE COVERAGE"
-        live_patterns = [
-            r'Live\s+Timing',
-            r'\bLive\b',
-            r'LIVE\s+COVERAGE'
-        ]
-
-        live_elements = []
-        for pattern in live_patterns:
-            live_elements.extend(soup.find_all(text=re.compile(pattern, re.IGNORECASE)))
-
-        if not live_elements:
-            return None
-
-        for element in live_elements:
-            parent = element.parent
-            while parent and parent.name != 'body':
-                row_text = parent.get_text().lower()
-                for session_text, session_type in session_text_map.items():
-                    if session_text in row_text:
-                        logger.info(f"Detected live session: {session_type}")
-                        return session_type
-                parent = parent.parent
+            self._quit_selenium_driver(driver)
 
-        return None
+        self.source.capture(url + "#rendered", html.encode('utf-8'), "render")
+        return self.parse_pool.run_sync(parsing.parse_session_dates, html)
 
-    async def _extract_sessions(self, client: httpx.AsyncClient, season: int, location: str, soup: BeautifulSoup, force_live_session: str = None) -> List[Dict]:
+    async def _extract_sessions(self, client: httpx.AsyncClient, season: int, round_id: int, location: str, page: Dict,
+                                force_live_session: str = None) -> List[Dict]:
         session_dates = await asyncio.to_thread(self._extract_all_session_dates_sync, season, location)
         logger.info(f"Extracted session dates for {location}: {list(session_dates.keys())}")
-        result_links = soup.find_all('a', href=re.compile(rf'/results/{season}/races/\d+/[^/]+/(practice|qualifying|sprint|race)'))
-        logger.info(f"Found {len(result_links)} result links: {[link.get('href', '') for link in result_links]}")
-
-        live_session_type = force_live_session if force_live_session else self._detect_live_session_from_html(soup)
+        result_links = page['result_links']
+        logger.info(f"Found {len(result_links)} result links: {result_links}")
+
+        if force_live_session:
+            live_session_type = force_live_session
+        elif self.source.replay:
+            # Replays rebuild historical data: only a forced live session is honoured
+            live_session_type = None
+        else:
+            live_session_type = await self._detect_live_session(client, season, location, session_dates, page)
         live_positions = []
         if live_session_type:
             logger.info(f"{'Forced' if force_live_session else 'Detected'} live session for {location}: {live_session_type}")
@@ -368,8 +321,7 @@ class F1WebsiteClient:
             'race-result': 'race'
         }
 
-        for link in result_links:
-            href = link.get('href', '')
+        for href in result_links:
             if not href or f'/results/{season}/' not in href:
                 continue
 
@@ -380,6 +332,7 @@ class F1WebsiteClient:
                     continue
 
                 try:
+                    budget.check()
                     full_url = href if href.startswith('http') else self.base_url + href
                     session_date = session_dates.get(session_type, 0)
 
@@ -391,7 +344,7 @@ class F1WebsiteClient:
 
                     logger.info(f"Fetching results for {session_type} from {href} (date: {session_date}, is_live: {is_live}, status: {status})")
 
-                    results = await asyncio.to_thread(self._fetch_session_results_sync, full_url)
+                    results = await self._session_results(season, round_id, session_type, status, full_url, session_date)
 
                     # If session is live but has results, those are partial/live results
                     if is_live and live_positions:
@@ -407,7 +360,7 @@ class F1WebsiteClient:
                         'status': status
                     })
                     fetched_types.add(session_type)
-                    await asyncio.sleep(0.5)
+                    await self.source.pause(0.5)
                     break
                 except Exception as e:
                     logger.error(f"Failed to fetch session {session_type}: {e}")
@@ -433,89 +386,109 @@ class F1WebsiteClient:
                     'status': status
                 })
 
-        return sessions
+        return harmonize_names(sessions)
+
+    async def _detect_live_session(self, client: httpx.AsyncClient, season: int, location: str,
+                                   session_dates: Dict[str, int], page: Dict) -> Optional[str]:
+        """Live session from the calendar, confirmed by live timing or the page's live markers.
+
+        The candidate is the session whose window (start .. expected end + grace) contains now.
+        Live timing's SessionInfo is authoritative when it describes that session; otherwise
+        the session counts as live inside its expected duration, and during the grace period
+        only if the page shows a live marker next to it.
+        """
+        now = int(datetime.now().timestamp())
+        windows = [SessionWindow(season, 0, location, session_type, start) for session_type, start in session_dates.items()]
+        candidate = live_window(windows, now, settings.LIVE_DETECTION_GRACE_SECONDS)
+        if not candidate:
+            return None
+
+        session_info = await self._check_live_timing_static(client)
+        if session_info and self._describes(session_info, candidate, location):
+            archive_status = (session_info.get('ArchiveStatus') or {}).get('Status', '')
+            session_status = session_info.get('SessionStatus', '')
+            if archive_status == 'Complete' or session_status in ('Finished', 'Finalised', 'Ends'):
+                logger.info(f"Live timing reports {candidate.session_type} at {location} as finished")
+                return None
+            logger.info(f"Live session {candidate.session_type} at {location} confirmed by live timing")
+            return candidate.session_type
+
+        if now <= candidate.end or candidate.session_type in page['live_mentions']:
+            logger.info(f"Detected live session from calendar for {location}: {candidate.session_type}")
+            return candidate.session_type
+        return None
+
+    @staticmethod
+    def _describes(session_info: Dict, candidate: SessionWindow, location: str) -> bool:
+        """Whether SessionInfo.json is about the candidate session, not just one of the same type.
+
+        Live timing keeps serving the last session until the next one starts, so the type alone
+        would let the previous weekend's finished race stand in for a live one. The start time
+        must match the calendar; without one, the meeting's location must.
+        """
+        if parsing.detect_session_type(str(session_info.get('Name', '')).lower()) != candidate.session_type:
+            return False
+        start = parsing.live_timing_start(session_info)
+        if start:
+            return abs(start - candidate.start) <= LIVE_TIMING_START_TOLERANCE_SECONDS
+        meeting = session_info.get('Meeting') or {}
+        names = {str(meeting.get(field) or '').lower() for field in ('Location', 'Name')}
+        names |= {str((meeting.get('Country') or {}).get('Name') or '').lower()}
+        wanted = location.lower().replace('-', ' ')
+        return any(name and (name in wanted or wanted in name) for name in names)
 
     def _convert_live_positions_to_results(self, live_positions: List[Dict]) -> List[Dict]:
         if isinstance(live_positions, list):
             return sorted(live_positions, key=lambda x: x.get('position', 0))
         return []
 
+    async def _session_results(self, season: int, round_id: int, session_type: str, status: str, url: str,
+                               session_date: int = 0) -> List[Dict]:
+        scrape = lambda: asyncio.to_thread(self._fetch_session_results_sync, url)
+        if self.results_source is None:
+            return await scrape()
+        return await self.results_source.results(season, round_id, session_type, status, scrape, session_date)
+
     def _fetch_session_results_sync(self, url: str) -> List[Dict]:
+        archived = self.source.replayed(url)
+        if archived is not None:
+            return self.parse_pool.run_sync(parsing.parse_session_results, archived.decode('utf-8'))
+
         driver = self._create_selenium_driver()
         try:
             driver.get(url)
-            # Wait up to 30 seconds for results table to load
             try:
-                WebDriverWait(driver, 30).until(lambda d: len(d.find_elements(By.CSS_SELECTOR, "table tbody tr")) > 0)
+                self.render_profile.wait_until_ready(driver, 'results')
             except Exception as e:
+                budget.check()
                 logger.warning(f"Timeout waiting for results table at {url}: {e}. Proceeding with empty results.")
                 return []
-            return self._parse_session_results(BeautifulSoup(driver.page_source, 'html.parser'))
+            html = driver.page_source
+            self.source.capture(url, html.encode('utf-8'), "render")
+            return self.parse_pool.run_sync(parsing.parse_session_results, html)
+        except (budget.BudgetExhausted, budget.FetchCancelled):
+            raise
         except Exception as e:
+            budget.check()
             logger.error(f"Error fetching session results from {url}: {e}")
             return []
         finally:
-            driver.quit()
-
-    def _parse_session_results(self, soup: BeautifulSoup) -> List[Dict]:
-        table = soup.select_one('table')
-        if not table:
-            return []
-
-        results = []
-        for row in table.select('tbody tr'):
-            cells = row.select('td')
-            if len(cells) < 5:
-                continue
-
-            try:
-                position_text = cells[0].text.strip()
-                position_match = re.search(r'\d+', position_text)
-                position = int(position_match.group()) if position_match else 0
-
-                number_text = cells[1].text.strip()
-                number_match = re.search(r'\d+', number_text)
-                driver_number = int(number_match.group()) if number_match else 0
-
-                driver_name_raw = cells[2].text.strip()
-                code_match = re.search(r'[A-Z]{3}$', driver_name_raw)
-                driver_code = code_match.group() if code_match else ''
-                driver_name = re.sub(r'[A-Z]{3}$', '', driver_name_raw).strip() or driver_name_raw
-
-                team = cells[3].text.strip()
-                cell_4_text = cells[4].text.strip()
-                is_race = cell_4_text.isdigit()
-
-                if is_race and len(cells) > 5:
-                    time = cells[5].text.strip()
-                    laps = int(cell_4_text)
-                else:
-                    time = cell_4_text
-                    laps = 0
-
-                results.append({
-                    'position': position,
-                    'driver_number': driver_number,
-                    'driver_name': driver_name,
-                    'driver_code': driver_code,
-                    'team': team,
-                    'time': time,
-                    'laps': laps
-                })
-            except:
-                continue
-        return results
+            self._quit_selenium_driver(driver)
 
     async def _fetch_with_retry(self, client: httpx.AsyncClient, url: str, max_retries: int = 3) -> str:
         for attempt in range(max_retries):
+            budget.check()
             try:
-                response = await client.get(url)
+                response = await self.guard.get(client, url)
                 response.raise_for_status()
                 return response.text
+            except CircuitOpen:
+                raise
             except Exception as e:
                 if attempt == max_retries - 1:
                     raise
                 wait_time = 2 ** attempt
+                budget.ensure(wait_time)
                 logger.warning(f"Retry {attempt + 1}/{max_retries} for {url}: {e}")
                 await asyncio.sleep(wait_time)
 
@@ -525,89 +498,55 @@ class F1WebsiteClient:
             response = await client.get(url)
 
             if response.status_code == 200:
-                return response.json()
+                # The live timing feed serves its JSON with a UTF-8 BOM
+                return json.loads(response.content.decode('utf-8-sig'))
             return None
         except Exception as e:
             logger.debug(f"No live session found: {e}")
             return None
 
     def _scrape_live_timing_page_sync(self, season: int) -> List[Dict]:
-        driver = self._create_selenium_driver()
+        url = "https://www.formula1.com/en/timing/f1-live-lite"
+        archived = self.source.replayed(url)
+        driver = self._create_selenium_driver() if archived is None else None
         try:
-            url = "https://www.formula1.com/en/timing/f1-live-lite"
-            driver.get(url)
-
-            try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "table"))
-                )
-            except Exception as e:
-                logger.warning(f"Failed to load live timing page: {e}. Returning empty results.")
-                return []
-
-            import time
-            time.sleep(2)
-
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
+            if archived is not None:
+                html = archived.decode('utf-8')
+            else:
+                driver.get(url)
+                try:
+                    self.render_profile.wait_until_ready(driver, 'live_timing')
+                except Exception as e:
+                    budget.check()
+                    logger.warning(f"Failed to load live timing page: {e}. Returning empty results.")
+                    return []
+                html = driver.page_source
+                self.source.capture(url, html.encode('utf-8'), "render")
+
+            rows = self.parse_pool.run_sync(parsing.parse_live_timing, html)
+            logger.info(f"Found {len(rows)} rows in live timing table")
             driver_number_mapping = self._fetch_driver_number_mapping(season)
 
-            results = []
-            table = soup.select_one('table')
-
-            if table:
-                rows = table.select('tbody tr')
-                logger.info(f"Found {len(rows)} rows in live timing table")
-
-                for row in rows:
-                    cells = row.select('td')
-
-                    position_match = re.search(r'\d+', cells[0].text.strip())
-                    position = int(position_match.group())
-
-                    driver_cell = cells[1]
-
-                    first_name_elem = driver_cell.select_one('.driverName span.font-normal')
-                    last_name_elem = driver_cell.select_one('.driverName span.uppercase')
-                    team_elem = driver_cell.select_one('.text-grey-60')
-                    code_elem = driver_cell.select_one('.font-formula.tablet\\:hidden')
-
-                    first_name = first_name_elem.text.strip() if first_name_elem else ''
-                    last_name = last_name_elem.text.strip() if last_name_elem else ''
-                    driver_name = f"{first_name} {last_name}".strip()
-                    team = team_elem.text.strip() if team_elem else ''
-                    driver_code = code_elem.text.strip() if code_elem else ''
-
-                    driver_number = 0
-                    number_elem = driver_cell.select_one('[data-driver-number]')
-                    if number_elem:
-                        driver_number = int(number_elem.get('data-driver-number'))
-
-                    if driver_number == 0:
-                        if not driver_code:
-                            raise Exception(f"Missing driver_code for position {position}, cannot lookup driver_number")
-                        if driver_code not in driver_number_mapping:
-                            raise Exception(f"Driver code '{driver_code}' not found in database for season {season}")
-                        driver_number = driver_number_mapping[driver_code]
-                        logger.info(f"Populated driver_number {driver_number} for {driver_code} from database")
-
-                    time_val = cells[2].text.strip()
-
-                    results.append({
-                        'position': position,
-                        'driver_number': driver_number,
-                        'driver_name': driver_name,
-                        'driver_code': driver_code,
-                        'team': team,
-                        'time': time_val,
-                        'laps': 0
-                    })
-
-            return results
+            for row in rows:
+                if row['driver_number'] == 0:
+                    driver_code = row['driver_code']
+                    if not driver_code:
+                        raise Exception(f"Missing driver_code for position {row['position']}, cannot lookup driver_number")
+                    if driver_code not in driver_number_mapping:
+                        raise Exception(f"Driver code '{driver_code}' not found in database for season {season}")
+                    row['driver_number'] = driver_number_mapping[driver_code]
+                    logger.info(f"Populated driver_number {row['driver_number']} for {driver_code} from database")
+
+            return rows
+        except (budget.BudgetExhausted, budget.FetchCancelled):
+            raise
         except Exception as e:
+            budget.check()
             logger.error(f"Error scraping live timing page: {e}. Returning empty results.")
             return []
         finally:
-            driver.quit()
+            if driver is not None:
+                self._quit_selenium_driver(driver)
 
     async def _fetch_live_positions_via_selenium(self, season: int) -> List[Dict]:
         return await asyncio.to_thread(self._scrape_live_timing_page_sync, season)
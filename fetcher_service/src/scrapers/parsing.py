@@ -0,0 +1,264 @@
+import json
+import re
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from bs4 import BeautifulSoup
+
+# CPU-bound HTML parsing for formula1.com pages. Every function here is module-level and
+# takes/returns plain picklable values so it can run in a process pool (see src/workers.py).
+
+SESSION_NAME_MAP = {
+    'practice 1': 'practice_1',
+    'practice 2': 'practice_2',
+    'practice 3': 'practice_3',
+    'qualifying': 'qualifying',
+    'sprint qualifying': 'sprint_qualifying',
+    'sprint': 'sprint',
+    'race': 'race'
+}
+
+def _sports_events(soup: BeautifulSoup) -> List[Dict]:
+    events = []
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string)
+            if data.get('@type') == 'SportsEvent':
+                events.append(data)
+        except:
+            pass
+    return events
+
+def _extract_round_name(events: List[Dict], season: int) -> Optional[str]:
+    for data in events:
+        if data.get('name'):
+            name = re.sub(rf'\s*{season}$', '', data['name']).strip()
+            name = re.sub(r'^FORMULA\s+1\s+', '', name, flags=re.IGNORECASE)
+            return name
+    return None
+
+def _extract_weekend_dates(events: List[Dict]) -> tuple:
+    for data in events:
+        try:
+            if data.get('startDate') and data.get('endDate'):
+                start_dt = datetime.fromisoformat(data['startDate'].replace('Z', '+00:00'))
+                end_dt = datetime.fromisoformat(data['endDate'].replace('Z', '+00:00'))
+                return int(start_dt.timestamp()), int(end_dt.timestamp())
+        except:
+            pass
+    return 0, 0
+
+def detect_session_type(name_lower: str, session_map: Dict[str, str] = SESSION_NAME_MAP) -> Optional[str]:
+    for key, type_val in session_map.items():
+        if key not in name_lower:
+            continue
+
+        if key == 'sprint' and 'qualifying' in name_lower:
+            return 'sprint_qualifying'
+        elif key == 'qualifying' and 'sprint' in name_lower:
+            continue
+        else:
+            return type_val
+    return None
+
+LIVE_PATTERN = re.compile(r'Live\s+Timing|\bLive\b|LIVE\s+COVERAGE', re.IGNORECASE)
+
+def live_timing_start(session_info: Dict) -> int:
+    """UTC start of the session described by live timing's SessionInfo.json, 0 if unknown.
+
+    StartDate is the circuit's local time; GmtOffset ("02:00:00", "-05:00:00") gives the zone.
+    """
+    try:
+        start = datetime.fromisoformat(session_info['StartDate'])
+        sign = -1 if str(session_info.get('GmtOffset', '')).startswith('-') else 1
+        hours, minutes, *_ = (int(part) for part in str(session_info.get('GmtOffset') or '0:0').lstrip('+-').split(':'))
+        return int(start.replace(tzinfo=timezone.utc).timestamp()) - sign * (hours * 3600 + minutes * 60)
+    except (KeyError, TypeError, ValueError):
+        return 0
+
+def live_mentions(soup: BeautifulSoup, window: int = 3) -> List[str]:
+    """Session types named close to a "Live" marker in document order.
+
+    Builds the page's text index in one pass, then looks at the `window` strings on each
+    side of every live marker: linear in page size, unlike climbing the ancestor chain.
+    """
+    texts = [text.lower() for text in soup.stripped_strings]
+    mentions = []
+    for i, text in enumerate(texts):
+        if not LIVE_PATTERN.search(text):
+            continue
+        for neighbour in texts[max(0, i - window):i + window + 1]:
+            session_type = detect_session_type(neighbour)
+            if session_type and session_type not in mentions:
+                mentions.append(session_type)
+    return mentions
+
+def parse_round_page(html: str, season: int) -> Dict:
+    soup = BeautifulSoup(html, 'html.parser')
+    events = _sports_events(soup)
+
+    circuit_name = ''
+    for data in events:
+        location_data = data.get('location', {})
+        if location_data.get('name'):
+            circuit_name = location_data['name']
+            break
+
+    img = soup.select_one('img[src*="/track/"], img[src*="Circuit"], img[src*="circuit"], img[alt*="circuit"], img[alt*="Circuit"]')
+    image_src = img['src'] if img and img.get('src') else None
+
+    laps = 0
+    dt_elem = soup.find('dt', text=re.compile(r'Number\s+of\s+Laps', re.IGNORECASE))
+    if dt_elem:
+        dd_elem = dt_elem.find_next_sibling('dd')
+        if dd_elem:
+            match = re.search(r'(\d+)', dd_elem.get_text().strip())
+            if match:
+                laps = int(match.group(1))
+
+    first_date, end_date = _extract_weekend_dates(events)
+    result_links = [
+        link.get('href', '')
+        for link in soup.find_all('a', href=re.compile(rf'/results/{season}/races/\d+/[^/]+/(practice|qualifying|sprint|race)'))
+    ]
+
+    return {
+        'round_name': _extract_round_name(events, season),
+        'circuit_name': circuit_name,
+        'circuit_image_src': image_src,
+        'laps': laps,
+        'first_date': first_date,
+        'end_date': end_date,
+        'result_links': result_links,
+        'live_mentions': live_mentions(soup)
+    }
+
+def parse_session_dates(html: str) -> Dict[str, int]:
+    soup = BeautifulSoup(html, 'lxml')
+    session_dates = {}
+
+    for script in soup.find_all('script'):
+        text = script.string
+        if not text or '"@type":"SportsEvent"' not in text:
+            continue
+
+        start = 0
+        while True:
+            event_start = text.find('"@type":"SportsEvent"', start)
+            if event_start == -1:
+                break
+
+            brace_start = text.rfind('{', 0, event_start)
+            if brace_start == -1:
+                break
+
+            brace_count = 1
+            pos = brace_start + 1
+            while pos < len(text) and brace_count > 0:
+                if text[pos] == '{':
+                    brace_count += 1
+                elif text[pos] == '}':
+                    brace_count -= 1
+                pos += 1
+
+            if brace_count == 0:
+                try:
+                    event_data = json.loads(text[brace_start:pos])
+                    if event_data.get('@type') == 'SportsEvent' and event_data.get('name') and event_data.get('startDate'):
+                        session_type = detect_session_type(event_data['name'].lower())
+                        if session_type and session_type not in session_dates:
+                            date_str = event_data['startDate'].replace('Z', '+00:00')
+                            session_dates[session_type] = int(datetime.fromisoformat(date_str).timestamp())
+                except:
+                    pass
+            start = event_start + 1
+    return session_dates
+
+def parse_session_results(html: str) -> List[Dict]:
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.select_one('table')
+    if not table:
+        return []
+
+    results = []
+    for row in table.select('tbody tr'):
+        cells = row.select('td')
+        if len(cells) < 5:
+            continue
+
+        try:
+            position_text = cells[0].text.strip()
+            position_match = re.search(r'\d+', position_text)
+            position = int(position_match.group()) if position_match else 0
+
+            number_text = cells[1].text.strip()
+            number_match = re.search(r'\d+', number_text)
+            driver_number = int(number_match.group()) if number_match else 0
+
+            driver_name_raw = cells[2].text.strip()
+            code_match = re.search(r'[A-Z]{3}$', driver_name_raw)
+            driver_code = code_match.group() if code_match else ''
+            driver_name = re.sub(r'[A-Z]{3}$', '', driver_name_raw).strip() or driver_name_raw
+
+            team = cells[3].text.strip()
+            cell_4_text = cells[4].text.strip()
+            is_race = cell_4_text.isdigit()
+
+            if is_race and len(cells) > 5:
+                time = cells[5].text.strip()
+                laps = int(cell_4_text)
+            else:
+                time = cell_4_text
+                laps = 0
+
+            results.append({
+                'position': position,
+                'driver_number': driver_number,
+                'driver_name': driver_name,
+                'driver_code': driver_code,
+                'team': team,
+                'time': time,
+                'laps': laps
+            })
+        except:
+            continue
+    return results
+
+def parse_live_timing(html: str) -> List[Dict]:
+    """Rows of the live timing table; driver_number is 0 when the page does not expose it"""
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.select_one('table')
+    if not table:
+        return []
+
+    results = []
+    for row in table.select('tbody tr'):
+        cells = row.select('td')
+
+        position_match = re.search(r'\d+', cells[0].text.strip())
+        position = int(position_match.group())
+
+        driver_cell = cells[1]
+
+        first_name_elem = driver_cell.select_one('.driverName span.font-normal')
+        last_name_elem = driver_cell.select_one('.driverName span.uppercase')
+        team_elem = driver_cell.select_one('.text-grey-60')
+        code_elem = driver_cell.select_one('.font-formula.tablet\\:hidden')
+
+        first_name = first_name_elem.text.strip() if first_name_elem else ''
+        last_name = last_name_elem.text.strip() if last_name_elem else ''
+
+        driver_number = 0
+        number_elem = driver_cell.select_one('[data-driver-number]')
+        if number_elem:
+            driver_number = int(number_elem.get('data-driver-number'))
+
+        results.append({
+            'position': position,
+            'driver_number': driver_number,
+            'driver_name': f"{first_name} {last_name}".strip(),
+            'driver_code': code_elem.text.strip() if code_elem else '',
+            'team': team_elem.text.strip() if team_elem else '',
+            'time': cells[2].text.strip(),
+            'laps': 0
+        })
+    return results
@@ -0,0 +1,128 @@
+import logging
+import time
+from typing import Dict, List, Optional
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+from .. import budget
+
+logger = logging.getLogger(__name__)
+
+# One readiness condition per page type: each predicate returns true as soon as
+# the data we extract from that page is in the DOM, not when the page finished loading.
+READINESS = {
+    'schedule': {
+        'timeout': 20,
+        'script': """
+            const season = arguments[0];
+            if (document.readyState === 'loading') return -1;
+            return Array.from(document.querySelectorAll(`a[href*="/racing/${season}/"]`))
+                .filter(card => /ROUND\\s+\\d+/i.test(card.textContent)).length;
+        """,
+        'stable': True
+    },
+    'event': {
+        'timeout': 20,
+        'script': """
+            return Array.from(document.getElementsByTagName('script'))
+                .some(s => s.textContent.includes('"@type":"SportsEvent"'));
+        """
+    },
+    'results': {
+        'timeout': 30,
+        'script': "return document.querySelectorAll('table tbody tr').length > 0;"
+    },
+    'live_timing': {
+        'timeout': 10,
+        'script': """
+            return Array.from(document.querySelectorAll('table tbody tr'))
+                .some(row => row.cells.length >= 3 && row.cells[2].textContent.trim().length > 0);
+        """
+    }
+}
+
+class _StableCount:
+    """Ready once the count reaches the expected number of elements or, when that is unknown
+    (or the page legitimately lists fewer), once it stayed unchanged for stable_for seconds.
+
+    A single unchanged poll is not enough: with the eager load strategy the list renders in
+    batches and two polls can easily land inside the same partial batch.
+    """
+
+    def __init__(self, script: str, args: tuple, stable_for: float, expected: Optional[int] = None):
+        self.script = script
+        self.args = args
+        self.stable_for = stable_for
+        self.expected = expected
+        self.last = None
+        self.since = 0.0
+
+    def __call__(self, driver) -> bool:
+        count = driver.execute_script(self.script, *self.args)
+        now = time.monotonic()
+        if count != self.last:
+            self.last = count
+            self.since = now
+        if count <= 0:
+            return False
+        if self.expected and count >= self.expected:
+            return True
+        return now - self.since >= self.stable_for
+
+class RenderProfile:
+    def __init__(self, page_load_strategy: str = "eager", block_images: bool = True,
+                 block_fonts: bool = True, blocked_hosts: List[str] = None, poll_frequency: float = 0.1,
+                 stable_for: float = 2.0):
+        self.page_load_strategy = page_load_strategy
+        self.block_images = block_images
+        self.block_fonts = block_fonts
+        self.blocked_hosts = blocked_hosts or []
+        self.poll_frequency = poll_frequency
+        self.stable_for = stable_for
+
+    @classmethod
+    def from_settings(cls, settings) -> "RenderProfile":
+        return cls(
+            page_load_strategy=settings.SELENIUM_PAGE_LOAD_STRATEGY,
+            block_images=settings.SELENIUM_BLOCK_IMAGES,
+            block_fonts=settings.SELENIUM_BLOCK_FONTS,
+            blocked_hosts=[h.strip() for h in settings.SELENIUM_BLOCKED_HOSTS.split(',') if h.strip()],
+            poll_frequency=settings.SELENIUM_READY_POLL_SECONDS,
+            stable_for=settings.SELENIUM_STABLE_COUNT_SECONDS
+        )
+
+    def chrome_options(self) -> Options:
+        options = Options()
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--mute-audio')
+        options.add_argument('--autoplay-policy=user-gesture-required')
+        options.page_load_strategy = self.page_load_strategy
+
+        prefs: Dict[str, int] = {}
+        if self.block_images:
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            prefs['profile.managed_default_content_settings.images'] = 2
+        if self.block_fonts:
+            options.add_argument('--disable-remote-fonts')
+        if prefs:
+            options.add_experimental_option('prefs', prefs)
+
+        if self.blocked_hosts:
+            rules = []
+            for host in self.blocked_hosts:
+                rules.append(f"MAP {host} ~NOTFOUND")
+                rules.append(f"MAP *.{host} ~NOTFOUND")
+            options.add_argument(f"--host-resolver-rules={', '.join(rules)}")
+
+        return options
+
+    def wait_until_ready(self, driver, page_type: str, *args, timeout: float = None, expected: int = None):
+        condition = READINESS[page_type]
+        if condition.get('stable'):
+            predicate = _StableCount(condition['script'], args, self.stable_for, expected)
+        else:
+            predicate = lambda d: d.execute_script(condition['script'], *args)
+
+        timeout = budget.clamp(timeout or condition['timeout'])
+        WebDriverWait(driver, timeout, poll_frequency=self.poll_frequency).until(predicate)
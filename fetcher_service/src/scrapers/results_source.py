@@ -0,0 +1,135 @@
+import logging
+import re
+import time
+from typing import Awaitable, Callable, Dict, List, Set, Tuple
+
+from .. import budget
+from ..metrics import registry
+from .ergast import SESSION_ENDPOINTS, ErgastClient
+
+logger = logging.getLogger(__name__)
+
+results_by_source = registry.counter("fetcher_session_results_total", "Session classifications by the source they came from")
+source_agreement = registry.counter("fetcher_results_agreement_total", "Ergast vs formula1.com classification comparisons")
+
+def compare_results(ergast_rows: List[Dict], scraped_rows: List[Dict]) -> List[int]:
+    """Positions where the two classifications name a different driver number"""
+    ergast_order = {row['position']: row['driver_number'] for row in ergast_rows}
+    scraped_order = {row['position']: row['driver_number'] for row in scraped_rows}
+    return sorted(
+        position for position in ergast_order.keys() | scraped_order.keys()
+        if ergast_order.get(position) != scraped_order.get(position)
+    )
+
+def normalize_time(value: str) -> str:
+    """One spelling for result times whichever source they came from (formula1.com's):
+    "1:27:39.209", "+7.356s", "+1 lap", "+2 laps", "DNF"."""
+    value = " ".join(value.split())
+    if re.fullmatch(r"\+\d+(\.\d+)?", value):
+        return f"{value}s"
+    laps = re.fullmatch(r"\+(\d+) laps?", value, re.IGNORECASE)
+    if laps:
+        count = int(laps.group(1))
+        return f"+{count} lap" if count == 1 else f"+{count} laps"
+    return value
+
+def normalize_results(rows: List[Dict]) -> List[Dict]:
+    return [dict(row, time=normalize_time(row.get('time', ''))) for row in rows]
+
+def harmonize_names(sessions: List[Dict]) -> List[Dict]:
+    """Rewrite Ergast-sourced rows of a round with formula1.com's driver and team spellings.
+
+    Ergast names teams by constructor ("Red Bull") and drops diacritics, while the
+    scraped sessions of the same round (practice, sprint qualifying) carry the
+    formula1.com spelling. Matching by driver number gives every session of the round one
+    spelling, whichever source each came from, so a source switch leaves content hashes
+    unchanged. Drivers with no scraped row this round keep Ergast's spelling.
+    """
+    spelling: Dict[int, Dict] = {}
+    for session in sessions:
+        if session['type'] in SESSION_ENDPOINTS:
+            continue
+        for row in session['results']:
+            if row.get('driver_number') and row.get('driver_name') and row.get('team'):
+                spelling.setdefault(row['driver_number'], row)
+
+    for session in sessions:
+        if session['type'] not in SESSION_ENDPOINTS:
+            continue
+        for row in session['results']:
+            known = spelling.get(row.get('driver_number'))
+            if known is None:
+                continue
+            for field in ('driver_name', 'team', 'driver_code'):
+                if known.get(field):
+                    row[field] = known[field]
+    return sessions
+
+class ResultsSource:
+    """Chooses where a session's classification comes from.
+
+    Finished races, qualifying sessions and sprints are read from Ergast's JSON. Practice,
+    sprint qualifying, live sessions and sessions Ergast has not published yet fall back to
+    rendering the formula1.com results page. The first Ergast read of each session that
+    ended within verify_window is also scraped and compared position by position; on
+    disagreement the scraped (official) classification is kept, and the session stays on
+    the browser from then on so its content does not flip between sources. Older sessions
+    are not re-verified, so a restart or a new replica does not render every past page
+    again. Times are normalized either way (names are, per round, by harmonize_names).
+    """
+
+    def __init__(self, ergast: ErgastClient, verify: bool = True, verify_window: float = 3 * 86400):
+        self.ergast = ergast
+        self.verify = verify
+        self.verify_window = verify_window
+        self._verified: Set[Tuple[int, int, str]] = set()
+        self._mismatched: Set[Tuple[int, int, str]] = set()
+
+    @classmethod
+    def from_settings(cls, settings, ergast: ErgastClient) -> "ResultsSource":
+        return cls(ergast, settings.RESULTS_VERIFY, settings.RESULTS_VERIFY_WINDOW_SECONDS)
+
+    async def _from_ergast(self, season: int, round_id: int, session_type: str) -> List[Dict]:
+        try:
+            return await self.ergast.fetch_session_results(season, round_id, session_type)
+        except (budget.BudgetExhausted, budget.FetchCancelled):
+            raise
+        except Exception as e:
+            logger.warning(f"Ergast results for {season}/{round_id} {session_type} unavailable: {e}")
+            return []
+
+    async def _scraped(self, session_type: str, scrape: Callable[[], Awaitable[List[Dict]]]) -> List[Dict]:
+        results_by_source.inc(session=session_type, source="browser")
+        return normalize_results(await scrape())
+
+    async def results(self, season: int, round_id: int, session_type: str, status: str,
+                      scrape: Callable[[], Awaitable[List[Dict]]], session_date: int = 0) -> List[Dict]:
+        session = (season, round_id, session_type)
+        if status != "finished" or session_type not in SESSION_ENDPOINTS or session in self._mismatched:
+            return await self._scraped(session_type, scrape)
+
+        ergast_rows = await self._from_ergast(season, round_id, session_type)
+        if not ergast_rows:
+            logger.info(f"Ergast has no {session_type} results for {season}/{round_id} yet, rendering the results page")
+            return await self._scraped(session_type, scrape)
+        ergast_rows = normalize_results(ergast_rows)
+
+        recent = time.time() - session_date <= self.verify_window
+        if self.verify and recent and session not in self._verified:
+            scraped_rows = normalize_results(await scrape())
+            if scraped_rows:
+                self._verified.add(session)
+                mismatches = compare_results(ergast_rows, scraped_rows)
+                if mismatches:
+                    self._mismatched.add(session)
+                    source_agreement.inc(session=session_type, outcome="mismatch")
+                    logger.warning(
+                        f"Ergast and formula1.com disagree on {season}/{round_id} {session_type} "
+                        f"at positions {mismatches}, keeping formula1.com"
+                    )
+                    results_by_source.inc(session=session_type, source="browser")
+                    return scraped_rows
+                source_agreement.inc(session=session_type, outcome="match")
+
+        results_by_source.inc(session=session_type, source="ergast")
+        return ergast_rows
@@ -0,0 +1,247 @@
+import contextvars
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from ..metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Render priority classes, most urgent first. Work in a lower class only gets a browser
+# slot when no higher class is waiting; since every page acquires and releases its own
+# slot, a long season sync yields to a live refresh at its next page boundary.
+PRIORITY_CLASSES = ("live", "round", "season", "backfill")
+DEFAULT_CLASS = "round"
+
+queue_wait_seconds = registry.histogram("fetcher_render_queue_wait_seconds", "Time spent waiting for a browser slot per priority class")
+queue_depth = registry.gauge("fetcher_render_queue_depth", "Page renders waiting for a browser slot per priority class")
+
+_render_class: contextvars.ContextVar[str] = contextvars.ContextVar("render_class", default=DEFAULT_CLASS)
+_render_flow: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("render_flow", default=None)
+_flow_ids = itertools.count(1)
+
+@contextmanager
+def render_context(priority: str, flow: str = None):
+    """Tag every render in the block with a priority class and a flow (one fetch).
+
+    Flows within a class are served round-robin, so two season syncs interleave pages
+    instead of running one after the other.
+    """
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown render priority: {priority}")
+    class_token = _render_class.set(priority)
+    flow_token = _render_flow.set(flow or f"{priority}-{next(_flow_ids)}")
+    try:
+        yield
+    finally:
+        _render_flow.reset(flow_token)
+        _render_class.reset(class_token)
+
+class _Ticket:
+    def __init__(self, priority: str, flow: str, seq: int):
+        self.priority = priority
+        self.rank = PRIORITY_CLASSES.index(priority)
+        self.flow = flow
+        self.seq = seq
+        self.enqueued = time.monotonic()
+
+class SeleniumNode:
+    def __init__(self, url: str, max_sessions: int = 1):
+        self.url = url.rstrip('/')
+        self.max_sessions = max_sessions
+        self.in_flight = 0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.last_probe_ok: Optional[bool] = None
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until and self.in_flight < self.max_sessions
+
+    def load(self) -> float:
+        return self.in_flight / self.max_sessions
+
+    def snapshot(self, now: float) -> Dict:
+        return {
+            "url": self.url,
+            "in_flight": self.in_flight,
+            "max_sessions": self.max_sessions,
+            "failures": self.failures,
+            "ejected": now < self.ejected_until,
+            "ejected_for": max(0.0, round(self.ejected_until - now, 1)),
+            "last_probe_ok": self.last_probe_ok
+        }
+
+class SeleniumPool:
+    """Spreads browser sessions across Selenium endpoints.
+
+    Nodes are picked least-loaded first and never above their session cap. A node that
+    fails to create sessions (or fails a /status probe) is ejected for a back-off period
+    that doubles on each consecutive ejection, then gets a single trial session.
+
+    When every slot is busy, waiters are granted in priority-class order; within a class
+    the flow with the fewest grants goes next (a flow joining a class starts level with
+    the least-served flow already waiting there).
+    """
+
+    def __init__(self, nodes: List[SeleniumNode], failure_threshold: int = 2, eject_seconds: float = 30.0,
+                 max_eject_seconds: float = 300.0, acquire_timeout: float = 120.0, probe_interval: float = 15.0):
+        if not nodes:
+            raise ValueError("At least one Selenium endpoint is required")
+        self.nodes = nodes
+        self.failure_threshold = failure_threshold
+        self.eject_seconds = eject_seconds
+        self.max_eject_seconds = max_eject_seconds
+        self.acquire_timeout = acquire_timeout
+        self.probe_interval = probe_interval
+        self._cond = threading.Condition()
+        self._waiters: List[_Ticket] = []
+        self._served: Dict[tuple, int] = {}
+        self._seq = itertools.count()
+        self._prober: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_settings(cls, settings) -> "SeleniumPool":
+        return cls(
+            parse_endpoints(settings.SELENIUM_URLS or settings.SELENIUM_URL, settings.SELENIUM_NODE_MAX_SESSIONS),
+            failure_threshold=settings.SELENIUM_NODE_FAILURE_THRESHOLD,
+            eject_seconds=settings.SELENIUM_NODE_EJECT_SECONDS,
+            acquire_timeout=settings.SELENIUM_ACQUIRE_TIMEOUT,
+            probe_interval=settings.SELENIUM_PROBE_INTERVAL_SECONDS
+        )
+
+    def acquire(self, timeout: float = None) -> SeleniumNode:
+        """Next free node for the calling render, in priority order (see render_context)"""
+        deadline = time.monotonic() + (timeout if timeout is not None else self.acquire_timeout)
+        with self._cond:
+            ticket = self._enqueue(_render_class.get(), _render_flow.get() or f"anonymous-{next(_flow_ids)}")
+            try:
+                while True:
+                    now = time.monotonic()
+                    candidates = [n for n in self.nodes if n.available(now)]
+                    if candidates and self._next_ticket() is ticket:
+                        node = min(candidates, key=lambda n: (n.load(), n.in_flight, n.failures))
+                        node.in_flight += 1
+                        self._grant(ticket)
+                        return node
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise RuntimeError(f"No Selenium node available within timeout ({len(self.nodes)} configured)")
+                    # Wake up when a slot is released or the earliest ejection ends
+                    wake_at = min([n.ejected_until for n in self.nodes if n.ejected_until > now], default=now + remaining)
+                    self._cond.wait(min(remaining, max(wake_at - now, 0.05)))
+            finally:
+                self._dequeue(ticket)
+
+    def _enqueue(self, priority: str, flow: str) -> _Ticket:
+        ticket = _Ticket(priority, flow, next(self._seq))
+        key = (priority, flow)
+        if key not in self._served:
+            waiting = [self._served[(t.priority, t.flow)] for t in self._waiters if t.priority == priority]
+            self._served[key] = min(waiting, default=0)
+        self._waiters.append(ticket)
+        queue_depth.set(sum(1 for t in self._waiters if t.priority == priority), **{"class": priority})
+        return ticket
+
+    def _next_ticket(self) -> Optional[_Ticket]:
+        if not self._waiters:
+            return None
+        return min(self._waiters, key=lambda t: (t.rank, self._served[(t.priority, t.flow)], t.seq))
+
+    def _grant(self, ticket: _Ticket):
+        self._served[(ticket.priority, ticket.flow)] += 1
+        queue_wait_seconds.observe(time.monotonic() - ticket.enqueued, **{"class": ticket.priority})
+
+    def _dequeue(self, ticket: _Ticket):
+        self._waiters.remove(ticket)
+        if not any(t.priority == ticket.priority and t.flow == ticket.flow for t in self._waiters):
+            del self._served[(ticket.priority, ticket.flow)]
+        queue_depth.set(sum(1 for t in self._waiters if t.priority == ticket.priority), **{"class": ticket.priority})
+        # The next ticket in line may be able to take a free slot now
+        self._cond.notify_all()
+
+    def release(self, node: SeleniumNode, failed: bool = False):
+        with self._cond:
+            node.in_flight = max(0, node.in_flight - 1)
+            if failed:
+                self._record_failure(node)
+            else:
+                node.failures = 0
+                node.ejections = 0
+            self._cond.notify_all()
+
+    def _record_failure(self, node: SeleniumNode):
+        node.failures += 1
+        if node.failures >= self.failure_threshold:
+            self._eject(node)
+
+    def _eject(self, node: SeleniumNode):
+        backoff = min(self.eject_seconds * (2 ** node.ejections), self.max_eject_seconds)
+        node.ejections += 1
+        # Leave one failure of headroom so the trial session after ejection re-ejects on failure
+        node.failures = self.failure_threshold - 1
+        node.ejected_until = time.monotonic() + backoff
+        logger.warning(f"Ejecting Selenium node {node.url} for {backoff:.0f}s")
+
+    def probe(self):
+        # Imported here so src.main can use render_context without loading httpx at startup
+        import httpx
+        for node in self.nodes:
+            try:
+                response = httpx.get(f"{node.url}/status", timeout=2.0)
+                ok = response.status_code == 200
+                # Grid answers 200 with ready=false when it cannot create sessions. That is also
+                # the case while a busy node's slots are all taken, so it does not eject a node,
+                # but an ejected one is only re-admitted once it is ready again.
+                ready = ok and response.json().get("value", {}).get("ready") is True
+            except Exception as e:
+                logger.debug(f"Selenium node {node.url} probe failed: {e}")
+                ok = ready = False
+
+            with self._cond:
+                node.last_probe_ok = ok
+                if ready and node.ejected_until > time.monotonic():
+                    logger.info(f"Selenium node {node.url} healthy again, re-admitting")
+                    node.ejected_until = 0.0
+                    self._cond.notify_all()
+                elif not ok and node.ejected_until <= time.monotonic():
+                    self._eject(node)
+
+    def _probe_loop(self):
+        while not self._stop.wait(self.probe_interval):
+            self.probe()
+
+    def start_probing(self):
+        if self._prober or self.probe_interval <= 0:
+            return
+        self._stop.clear()
+        self._prober = threading.Thread(target=self._probe_loop, name="selenium-prober", daemon=True)
+        self._prober.start()
+
+    def stop_probing(self):
+        self._stop.set()
+        self._prober = None
+
+    def snapshot(self) -> List[Dict]:
+        with self._cond:
+            now = time.monotonic()
+            return [n.snapshot(now) for n in self.nodes]
+
+    def queue_snapshot(self) -> Dict[str, int]:
+        with self._cond:
+            return {c: sum(1 for t in self._waiters if t.priority == c) for c in PRIORITY_CLASSES}
+
+def parse_endpoints(value: str, default_max_sessions: int = 1) -> List[SeleniumNode]:
+    """Parse 'http://a:4444|2,http://b:4444' into nodes; '|N' overrides the per-node session cap"""
+    nodes = []
+    for entry in value.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        url, _, cap = entry.partition('|')
+        nodes.append(SeleniumNode(url.strip(), int(cap) if cap else default_max_sessions))
+    return nodes
@@ -0,0 +1,58 @@
+from typing import Dict, Iterable, List, Optional
+
+# Expected on-track duration per session type, in seconds. Used to place each
+# session's end on the calendar (start times come from the stored rounds).
+SESSION_DURATIONS = {
+    'practice_1': 60 * 60,
+    'practice_2': 60 * 60,
+    'practice_3': 60 * 60,
+    'qualifying': 60 * 60,
+    'sprint_qualifying': 45 * 60,
+    'sprint': 60 * 60,
+    'race': 2 * 60 * 60
+}
+DEFAULT_DURATION = 60 * 60
+
+def session_end(session_type: str, start: int) -> int:
+    return start + SESSION_DURATIONS.get(session_type, DEFAULT_DURATION)
+
+class SessionWindow:
+    def __init__(self, season: int, round_id: int, round_name: str, session_type: str, start: int, status: str = ""):
+        self.season = season
+        self.round_id = round_id
+        self.round_name = round_name
+        self.session_type = session_type
+        self.start = start
+        self.end = session_end(session_type, start)
+        self.status = status
+
+    def contains(self, ts: int, grace: int = 0) -> bool:
+        return self.start <= ts <= self.end + grace
+
+    def to_dict(self) -> Dict:
+        return {
+            "season": self.season,
+            "round_id": self.round_id,
+            "round_name": self.round_name,
+            "type": self.session_type,
+            "start": self.start,
+            "expected_end": self.end,
+            "stored_status": self.status
+        }
+
+def build_timeline(rounds: Iterable) -> List[SessionWindow]:
+    """Session windows from stored Round messages, ordered by start"""
+    windows = [
+        SessionWindow(rnd.season, rnd.round_id, rnd.name, session.type, session.date, session.status)
+        for rnd in rounds
+        for session in rnd.sessions
+        if session.date
+    ]
+    windows.sort(key=lambda w: w.start)
+    return windows
+
+def live_window(windows: List[SessionWindow], ts: int, grace: int = 0) -> Optional[SessionWindow]:
+    for window in windows:
+        if window.contains(ts, grace):
+            return window
+    return None
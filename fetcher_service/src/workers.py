@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+parse_seconds = registry.histogram("fetcher_parse_seconds", "Time spent in the parse pool per task")
+loop_lag_seconds = registry.histogram("fetcher_event_loop_lag_seconds", "Event loop scheduling delay")
+loop_lag_last = registry.gauge("fetcher_event_loop_lag_last_seconds", "Most recent event loop lag sample")
+
+class ParsePool:
+    """Runs CPU-bound parsing away from the event loop.
+
+    kind is 'process' (real parallelism, functions and arguments must be picklable),
+    'thread' (cheaper to start, still GIL-bound) or 'inline' (no pool, for debugging).
+    """
+
+    def __init__(self, kind: str = "process", size: int = 2):
+        if kind not in ("process", "thread", "inline"):
+            raise ValueError(f"Unknown parse pool kind: {kind}")
+        self.kind = kind
+        self.size = size
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings) -> "ParsePool":
+        return cls(settings.PARSE_POOL_KIND, settings.PARSE_POOL_SIZE)
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.kind == "inline":
+            return None
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    # Never fork: by now the process holds a gRPC channel and probe/monitor threads,
+                    # and a forked child can inherit their locks mid-use and deadlock
+                    context = multiprocessing.get_context("forkserver")
+                    self._executor = ProcessPoolExecutor(max_workers=self.size, mp_context=context)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="parse")
+            return self._executor
+
+    async def run(self, fn, *args):
+        """Await fn(*args) from the event loop"""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                return fn(*args)
+            return await loop.run_in_executor(executor, fn, *args)
+        finally:
+            parse_seconds.observe(loop.time() - start, fn=fn.__name__)
+
+    def run_sync(self, fn, *args):
+        """Call fn(*args) from a worker thread, blocking until the result is ready"""
+        start = time.monotonic()
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                return fn(*args)
+            return executor.submit(fn, *args).result()
+        finally:
+            parse_seconds.observe(time.monotonic() - start, fn=fn.__name__)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes up a sleeping task"""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            loop_lag_seconds.observe(lag)
+            loop_lag_last.set(lag)
+            if lag > 1.0:
+                logger.warning(f"Event loop blocked for {lag:.2f}s")
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
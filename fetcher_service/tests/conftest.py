@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the service as `src`, like uvicorn does from fetcher_service/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,196 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from src.leases import LeaseManager, MemoryLeaseBackend, RedisLeaseBackend
+
+# Redis tests run against a local instance (docker compose up redis) and are skipped
+# when none answers at LEASE_TEST_REDIS_URI.
+REDIS_URI = os.environ.get("LEASE_TEST_REDIS_URI", "redis://localhost:6379/15")
+
+def _redis_available() -> bool:
+    async def ping():
+        backend = RedisLeaseBackend(REDIS_URI)
+        try:
+            return await backend.client.ping()
+        finally:
+            await backend.close()
+    try:
+        return asyncio.run(ping())
+    except Exception:
+        return False
+
+@pytest.fixture(params=["memory", "redis"])
+def make_backend(request):
+    if request.param == "redis":
+        if not _redis_available():
+            pytest.skip(f"no Redis at {REDIS_URI}")
+        return lambda: RedisLeaseBackend(REDIS_URI)
+    shared = MemoryLeaseBackend()
+    return lambda: shared
+
+def _managers(make_backend, count: int, **kwargs):
+    # A fresh prefix per test keeps Redis runs independent of each other
+    prefix = f"test-{uuid.uuid4().hex}"
+    options = {"ttl": 0.6, "wait_poll": 0.02, "prefix": prefix, **kwargs}
+    return [LeaseManager(make_backend(), **options) for _ in range(count)]
+
+async def _close(managers):
+    for manager in managers:
+        await manager.close()
+
+class FlakyExtend:
+    """Wraps a backend so extend() raises a given number of times first"""
+
+    def __init__(self, backend, failures: int):
+        self.backend = backend
+        self.failures = failures
+
+    async def extend(self, key, token, ttl_ms):
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("backend blip")
+        return await self.backend.extend(key, token, ttl_ms)
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+class Unreachable:
+    async def acquire(self, key, token, ttl_ms):
+        raise ConnectionError("connection refused")
+
+    async def get_result(self, key):
+        raise ConnectionError("connection refused")
+
+    async def close(self):
+        pass
+
+def test_concurrent_callers_share_one_run(make_backend):
+    async def scenario():
+        managers = _managers(make_backend, 4)
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.2)
+            return {"count": len(calls)}
+
+        try:
+            results = await asyncio.gather(*(m.run_once("rounds:2024:all", work) for m in managers))
+        finally:
+            await _close(managers)
+        assert calls == [1]
+        assert results == [{"count": 1}] * 4
+    asyncio.run(scenario())
+
+def test_failure_is_shared_not_retried(make_backend):
+    async def scenario():
+        managers = _managers(make_backend, 4)
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            raise HTTPException(status_code=502, detail="render failed")
+
+        try:
+            results = await asyncio.gather(*(m.run_once("rounds:2024:3", work) for m in managers),
+                                           return_exceptions=True)
+        finally:
+            await _close(managers)
+        assert calls == [1]
+        assert all(isinstance(r, HTTPException) and r.status_code == 502 for r in results)
+    asyncio.run(scenario())
+
+def test_waiter_takes_over_expired_lease(make_backend):
+    async def scenario():
+        manager, = _managers(make_backend, 1, ttl=0.2)
+        key, _ = manager._keys("seasons")
+        # A replica that took the lease and died without releasing it
+        await manager.backend.acquire(key, "dead-replica:1:abc", 200)
+
+        async def work():
+            return {"ok": True}
+
+        try:
+            assert await manager.run_once("seasons", work) == {"ok": True}
+        finally:
+            await manager.close()
+    asyncio.run(scenario())
+
+def test_heartbeat_survives_backend_errors(make_backend):
+    async def scenario():
+        holder, waiter = _managers(make_backend, 2, ttl=0.9)
+        holder.backend = FlakyExtend(holder.backend, failures=2)
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(2.0)
+            return {"ok": True}
+
+        async def late():
+            await asyncio.sleep(0.1)
+            return await waiter.run_once("seasons", work)
+
+        try:
+            results = await asyncio.gather(holder.run_once("seasons", work), late())
+        finally:
+            await _close([holder, waiter])
+        assert calls == [1]
+        assert results == [{"ok": True}] * 2
+    asyncio.run(scenario())
+
+def test_lost_lease_cancels_work(make_backend):
+    async def scenario():
+        manager, = _managers(make_backend, 1, ttl=0.3)
+        finished = []
+
+        async def work():
+            # Another replica takes over, e.g. after a long pause on this one
+            key, _ = manager._keys("seasons")
+            holder = await manager.backend.holder(key)
+            await manager.backend.release(key, holder)
+            await manager.backend.acquire(key, "other-replica:1:abc", 5000)
+            await asyncio.sleep(1.0)
+            finished.append(1)
+            return {"ok": True}
+
+        try:
+            with pytest.raises(HTTPException) as error:
+                await manager.run_once("seasons", work)
+        finally:
+            await manager.close()
+        assert error.value.status_code == 503
+        assert finished == []
+    asyncio.run(scenario())
+
+def test_fresh_result_is_reused(make_backend):
+    async def scenario():
+        first, second = _managers(make_backend, 2)
+        calls = []
+
+        async def work():
+            calls.append(1)
+            return {"count": len(calls)}
+
+        try:
+            assert await first.run_once("rounds:2024:5:race", work, fresh_for=60) == {"count": 1}
+            assert await second.run_once("rounds:2024:5:race", work, fresh_for=60) == {"count": 1}
+            assert await second.run_once("rounds:2024:5:race", work) == {"count": 2}
+        finally:
+            await _close([first, second])
+    asyncio.run(scenario())
+
+def test_unreachable_backend_runs_unleased():
+    async def scenario():
+        manager = LeaseManager(Unreachable())
+
+        async def work():
+            return {"ok": True}
+
+        assert await manager.run_once("seasons", work, fresh_for=60) == {"ok": True}
+    asyncio.run(scenario())